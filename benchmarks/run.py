@@ -0,0 +1,178 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Callable, Dict, List, Optional
+
+# Benchmarks never touch the network or the developer's caches and replay log
+os.environ["POKEAPI_CACHE"] = "0"
+os.environ["POKEMON_DATASET"] = ""
+os.environ["POKEMON_ASSETS"] = "0"
+os.environ["POKEMON_REPLAY_LOG"] = ""
+
+import numpy as np
+
+from classes import PROJECT_ROOT
+from classes.damage import calculate_damage_batch
+from classes.get_data import GetData
+from classes.local_pokeapi import LocalPokeAPI, seed_cache, synthetic_fixtures
+from classes.lru_cache import LRUCache
+from classes.plot_charts import PlotCharts
+from classes.response_cache import ResponseCache
+
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, "benchmarks", "results")
+
+
+def timed(function: Callable[[], object], repeat: int, setup: Optional[Callable[[], object]] = None) -> List[float]:
+    """Runs a function repeat times, calling setup untimed before each run, and returns each duration in seconds."""
+    durations = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - start)
+    return durations
+
+
+def summary(durations: List[float]) -> Dict[str, float]:
+    """Returns the median, minimum and maximum of durations in milliseconds."""
+    return {
+        "median_ms": statistics.median(durations) * 1000,
+        "min_ms": min(durations) * 1000,
+        "max_ms": max(durations) * 1000,
+    }
+
+
+def bench_calculate_damage(quick: bool) -> Dict[str, float]:
+    """Throughput of the scalar GetData.calculate_damage and the vectorised batch calculator."""
+    n = 100_000 if quick else 1_000_000
+    start = time.perf_counter()
+    for _ in range(n):
+        GetData.calculate_damage(50, 110, 80, 90, 85, 1)
+    scalar = time.perf_counter() - start
+    start = time.perf_counter()
+    calculate_damage_batch(50, np.full(n, 110), np.full(n, 80), np.full(n, 90), np.full(n, 85), 1, rng=0)
+    batch = time.perf_counter() - start
+    return {"scalar_calls_per_s": n / scalar, "batch_calls_per_s": n / batch}
+
+
+def bench_attacks(quick: bool, latency: float) -> Dict[str, float]:
+    """Latency of GetData.attacks for a 40-move Pokémon against the local PokeAPI server, with nothing cached."""
+    get_data = GetData()
+    with LocalPokeAPI(synthetic_fixtures(), latency=latency) as api:
+        GetData.base_url = api.base_url
+        try:
+            pokemon = GetData.get_pokemon_data(25)
+            durations = timed(lambda: get_data.attacks(pokemon), 3 if quick else 10, setup=GetData.move_cache.clear)
+        finally:
+            GetData.base_url = "https://pokeapi.co/api/v2"
+    return {"latency_s": latency, "moves": len(pokemon["moves"]), **summary(durations)}
+
+
+def bench_plot_charts(quick: bool) -> Dict[str, float]:
+    """Cold construction time of each PlotCharts figure, bypassing the figure caches."""
+    fixtures = synthetic_fixtures()
+    user, opponent = fixtures["pokemon"]["1"], fixtures["pokemon"]["2"]
+    repeat = 20 if quick else 100
+
+    def stats_chart():
+        PlotCharts._stats_comparison_figure.clear()
+        PlotCharts.plot_stats_comparison(user, opponent)
+
+    def attack_chart():
+        PlotCharts._attack_chart.clear()
+        PlotCharts.create_attack_chart({"name": "tackle", "power": 35, "accuracy": 95, "pp": 35})
+
+    return {
+        "stats_comparison": summary(timed(stats_chart, repeat)),
+        "attack_chart": summary(timed(attack_chart, repeat)),
+    }
+
+
+def bench_rerun(quick: bool) -> Dict[str, float]:
+    """Full streamlit_app.py rerun time, served offline from a pre-seeded response cache."""
+    from streamlit.testing.v1 import AppTest
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ResponseCache(os.path.join(directory, "pokeapi.sqlite3"), offline=True)
+        seed_cache(cache, synthetic_fixtures())
+        GetData.response_cache = cache
+        GetData.pokemon_cache, GetData.attacks_cache = LRUCache(256), LRUCache(256)
+        GetData.move_cache.clear()
+        try:
+            app = AppTest.from_file(os.path.join(PROJECT_ROOT, "streamlit_app.py"), default_timeout=120)
+            first = timed(app.run, 1)
+            app.button[0].click()
+            battle = timed(app.run, 1)
+            reruns = timed(app.run, 3 if quick else 10)
+        finally:
+            GetData.response_cache = None
+            cache.close()
+    return {"first_run_ms": first[0] * 1000, "battle_start_ms": battle[0] * 1000, "rerun": summary(reruns)}
+
+
+def git_commit() -> str:
+    """Returns the short hash of the checked-out commit, or "unknown"."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=PROJECT_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(current: dict, baseline: dict) -> None:
+    """Prints the ratio of every numeric result to a baseline run."""
+    def flatten(results: dict, prefix: str = "") -> Dict[str, float]:
+        flat = {}
+        for key, value in results.items():
+            if isinstance(value, dict):
+                flat.update(flatten(value, f"{prefix}{key}."))
+            elif isinstance(value, (int, float)):
+                flat[f"{prefix}{key}"] = value
+        return flat
+
+    now, before = flatten(current["results"]), flatten(baseline["results"])
+    print(f"\nComparison with {baseline['commit']}:")
+    for key, value in now.items():
+        if before.get(key):
+            print(f"  {key:<45} {before[key]:>14.2f} -> {value:>14.2f}  ({value / before[key]:.2f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the benchmark suite without network access.")
+    parser.add_argument("--quick", action="store_true", help="Fewer iterations for a fast smoke run.")
+    parser.add_argument("--latency", type=float, default=0.05, help="Latency in seconds injected by the local PokeAPI server.")
+    parser.add_argument("--out", default=None, help="Results file. Defaults to benchmarks/results/<commit>.json.")
+    parser.add_argument("--compare", default=None, help="Results file of an earlier run to compare against.")
+    args = parser.parse_args()
+
+    results = {
+        "calculate_damage": bench_calculate_damage(args.quick),
+        "attacks": bench_attacks(args.quick, args.latency),
+        "plot_charts": bench_plot_charts(args.quick),
+        "rerun": bench_rerun(args.quick),
+    }
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "quick": args.quick,
+        "results": results,
+    }
+    out = args.out or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(json.dumps(results, indent=2))
+    print(f"\nWrote {out}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
@@ -0,0 +1,5 @@
+import os
+
+
+# Root of the repository, from which default data and cache locations are built
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -0,0 +1,333 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import requests
+
+from classes import PROJECT_ROOT
+from classes.http_client import HttpClient
+from classes.lru_cache import LRUCache
+from classes.profiling import profiler
+
+
+DEFAULT_DIR = os.path.join(PROJECT_ROOT, ".cache", "assets")
+DEFAULT_ATLAS_PATH = os.path.join(PROJECT_ROOT, "data", "sprites.atlas")
+ATLAS_MAGIC = b"PKATLAS1"
+
+
+def cry_url(number: int) -> str:
+    """Returns the URL of a Pokémon's cry."""
+    return f"https://veekun.com/dex/media/pokemon/cries/{number}.ogg"
+
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Writes a file through a temporary file and a rename, so readers never see a partial file."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class SpriteAtlas:
+    """
+    Read-only pack of sprite files memory-mapped from a single atlas file.
+
+    The file holds the magic bytes, the length of a JSON index mapping each URL to its offset and
+    length, the index itself and then every sprite back to back. Lookups slice the mapping, so
+    sprites are paged in by the operating system rather than read into memory up front.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+        - path (str): Location of the atlas file.
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(ATLAS_MAGIC)] != ATLAS_MAGIC:
+            self._mmap.close()
+            raise ValueError(f"Not a sprite atlas: {path}")
+        start = len(ATLAS_MAGIC) + 4
+        (index_size,) = struct.unpack("<I", self._mmap[len(ATLAS_MAGIC):start])
+        self._index: Dict[str, Tuple[int, int]] = json.loads(self._mmap[start:start + index_size])
+        self._base = start + index_size
+
+    @staticmethod
+    def write(path: str, sprites: Dict[str, bytes]) -> None:
+        """
+        Writes an atlas file.
+
+        Args:
+        - path (str): Location to write the atlas to.
+        - sprites (Dict[str, bytes]): Sprite bytes keyed by URL.
+        """
+        index, offset = {}, 0
+        for url, data in sprites.items():
+            index[url] = (offset, len(data))
+            offset += len(data)
+        header = json.dumps(index, separators=(",", ":")).encode("utf-8")
+        _atomic_write(path, b"".join([ATLAS_MAGIC, struct.pack("<I", len(header)), header, *sprites.values()]))
+
+    def get(self, url: str) -> Optional[bytes]:
+        """Returns the bytes of a sprite, or None if it is not in the atlas."""
+        entry = self._index.get(url)
+        if entry is None:
+            return None
+        offset, size = entry
+        return self._mmap[self._base + offset:self._base + offset + size]
+
+    def close(self) -> None:
+        """Unmaps the atlas file."""
+        self._mmap.close()
+
+    def __contains__(self, url: str) -> bool:
+        return url in self._index
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+class AssetCache:
+    """
+    Local cache of sprite images and cry sounds, so each is downloaded once and served as bytes.
+
+    Files are stored under the SHA-256 of their content, so identical assets behind different URLs
+    are kept once, with a small pointer file per URL naming the content. Recently served assets
+    are also kept in memory, and sprites found in the prebuilt atlas are read from it directly.
+    """
+
+    def __init__(self, directory: str = DEFAULT_DIR, http_client: Optional[HttpClient] = None,
+                 atlas: Optional[SpriteAtlas] = None, memory_items: int = 256, offline: bool = False):
+        """
+        Args:
+        - directory (str): Root of the content-addressed store.
+        - http_client (HttpClient or None): Client used to download missing assets. Defaults to a new client.
+        - atlas (SpriteAtlas or None): Prebuilt sprite atlas consulted before the store.
+        - memory_items (int): Number of assets kept in memory.
+        - offline (bool): Whether to serve only assets already stored, never downloading.
+        """
+        self.directory = directory
+        self.http_client = http_client or HttpClient()
+        self.atlas = atlas
+        self.offline = offline
+        self.memory = LRUCache(maxsize=memory_items)
+        self._lock = threading.Lock()
+        self._missing: set = set()
+        self._pending: set = set()
+        self._background: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_env(cls, http_client: Optional[HttpClient] = None) -> Optional["AssetCache"]:
+        """
+        Creates an asset cache configured from environment variables.
+
+        - POKEMON_ASSETS: set to "0" to disable the cache and let browsers fetch assets directly.
+        - POKEMON_ASSETS_PATH: root of the content-addressed store.
+        - POKEMON_ATLAS: location of the sprite atlas, loaded when the file exists.
+        - POKEAPI_OFFLINE: set to "1" to never download assets.
+
+        Args:
+        - http_client (HttpClient or None): Client used to download missing assets.
+
+        Returns:
+        - AssetCache or None: The configured cache, or None if disabled.
+        """
+        if os.environ.get("POKEMON_ASSETS", "1") == "0":
+            return None
+        atlas_path = os.environ.get("POKEMON_ATLAS", DEFAULT_ATLAS_PATH)
+        return cls(
+            directory=os.environ.get("POKEMON_ASSETS_PATH", DEFAULT_DIR),
+            http_client=http_client,
+            atlas=SpriteAtlas(atlas_path) if atlas_path and os.path.exists(atlas_path) else None,
+            offline=os.environ.get("POKEAPI_OFFLINE", "0") == "1",
+        )
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        """Returns the content address of some bytes."""
+        return hashlib.sha256(data).hexdigest()
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.directory, "objects", digest[:2], digest)
+
+    def _pointer_path(self, url: str) -> str:
+        return os.path.join(self.directory, "urls", hashlib.sha256(url.encode("utf-8")).hexdigest())
+
+    def _read_stored(self, url: str) -> Optional[bytes]:
+        """Returns the stored bytes of a URL, or None if it has not been downloaded."""
+        try:
+            with open(self._pointer_path(url), encoding="ascii") as f:
+                digest = f.read().strip()
+            with open(self._object_path(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def store(self, url: str, data: bytes) -> str:
+        """
+        Stores the bytes of a URL in the content-addressed store.
+
+        Args:
+        - url (str): The asset URL.
+        - data (bytes): The asset bytes.
+
+        Returns:
+        - str: The content address.
+        """
+        digest = self.digest(data)
+        path = self._object_path(digest)
+        if not os.path.exists(path):
+            _atomic_write(path, data)
+        _atomic_write(self._pointer_path(url), digest.encode("ascii"))
+        self.memory.put(url, data)
+        return digest
+
+    def get(self, url: str, download: bool = True) -> Optional[bytes]:
+        """
+        Returns the bytes of an asset, downloading and storing it on first use.
+
+        Args:
+        - url (str): The asset URL.
+        - download (bool): Whether to download a missing asset before returning. When False, a missing
+          asset is downloaded in the background instead and None is returned straight away.
+
+        Returns:
+        - bytes or None: The asset bytes, or None if it is unavailable.
+        """
+        start = time.perf_counter()
+        source = "error"
+        try:
+            data = self.memory.get(url)
+            if data is not None:
+                source = "memory"
+                return data
+            data = self.atlas.get(url) if self.atlas else None
+            if data is not None:
+                source = "atlas"
+                self.memory.put(url, data)
+                return data
+            data = self._read_stored(url)
+            if data is not None:
+                source = "disk"
+                self.memory.put(url, data)
+                return data
+            with self._lock:
+                if self.offline or url in self._missing:
+                    return None
+            if not download:
+                source = "queued"
+                self._download_later(url)
+                return None
+            try:
+                data = self.http_client.get_bytes(url)
+            except requests.exceptions.RequestException:
+                with self._lock:
+                    self._missing.add(url)  # Do not retry a failed asset on every rerun of this process
+                return None
+            self.store(url, data)
+            source = "network"
+            return data
+        finally:
+            profiler.record_fetch(url, time.perf_counter() - start, f"asset_{source}")
+
+    def _download_later(self, url: str) -> None:
+        """Downloads and stores an asset in a background thread, once however often it is requested meanwhile."""
+        with self._lock:
+            if url in self._pending:
+                return
+            self._pending.add(url)
+            if self._background is None:
+                self._background = ThreadPoolExecutor(max_workers=4, thread_name_prefix="asset-download")
+        self._background.submit(self._download, url)
+
+    def _download(self, url: str) -> None:
+        try:
+            self.get(url)
+        finally:
+            with self._lock:
+                self._pending.discard(url)
+
+    def prefetch(self, urls: Iterable[str], workers: int = 8) -> List[str]:
+        """
+        Downloads and stores assets concurrently.
+
+        Args:
+        - urls (Iterable[str]): The asset URLs.
+        - workers (int): Maximum number of concurrent downloads.
+
+        Returns:
+        - List[str]: The URLs that could not be fetched.
+        """
+        urls = list(dict.fromkeys(urls))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self.get, urls))
+        return [url for url, data in zip(urls, results) if data is None]
+
+
+def build_atlas(cache: AssetCache, pokemon: Iterable[dict], path: str = DEFAULT_ATLAS_PATH) -> List[str]:
+    """
+    Downloads the sprites and cries of a roster into the cache and writes its sprites to an atlas file.
+
+    Args:
+    - cache (AssetCache): The asset cache to fill.
+    - pokemon (Iterable[dict]): The Pokémon records.
+    - path (str): Location to write the atlas to.
+
+    Returns:
+    - List[str]: The URLs that could not be fetched.
+    """
+    pokemon = list(pokemon)
+    sprite_urls = [
+        url
+        for record in pokemon
+        for url in (record["sprites"]["front_default"], record["sprites"]["back_default"])
+        if url
+    ]
+    failed = cache.prefetch(sprite_urls + [cry_url(record["id"]) for record in pokemon])
+    sprites = {url: cache.get(url) for url in dict.fromkeys(sprite_urls) if url not in failed}
+    SpriteAtlas.write(path, sprites)
+    return failed
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the local sprite and cry cache.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Download the roster's sprites and cries and write the sprite atlas.")
+    build_parser.add_argument("--limit", type=int, default=151, help="Number of Pokémon to include.")
+    build_parser.add_argument("--out", default=DEFAULT_ATLAS_PATH, help="Location to write the atlas to.")
+    args = parser.parse_args()
+
+    from classes.get_data import GetData
+
+    cache = GetData.asset_cache
+    if cache is None:
+        parser.error("The asset cache is disabled (POKEMON_ASSETS=0)")
+    cache.atlas = None  # Always rebuild from the store, never from a previous atlas
+    roster = []
+    for number in range(1, args.limit + 1):
+        record = GetData.get_pokemon_data(number)
+        if not record:
+            raise SystemExit(f"Could not fetch Pokémon {number}")
+        roster.append(record)
+    failed = build_atlas(cache, roster, args.out)
+    print(f"Wrote {args.out}")
+    if failed:
+        print(f"{len(failed)} assets failed:")
+        for url in failed:
+            print(f"  {url}")
+        raise SystemExit(1)
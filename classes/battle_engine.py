@@ -0,0 +1,171 @@
+import random
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from classes.damage import hit_chance, hit_damage
+
+
+LEVEL = 50
+MODIFIER = 1
+USER = 0
+OPPONENT = 1
+
+
+@dataclass(frozen=True, slots=True)
+class Move:
+    """A move as used in battle: its name, base power and accuracy."""
+    name: str
+    power: Optional[int]
+    accuracy: Optional[int]
+
+
+@dataclass(frozen=True, slots=True)
+class Combatant:
+    """The battle-relevant stats of a Pokémon and its moveset."""
+    id: int
+    name: str
+    hp: int
+    attack: int
+    defense: int
+    moves: Tuple[Move, ...]
+
+    @classmethod
+    def from_pokemon(cls, pokemon: dict, attacks: List[dict]) -> "Combatant":
+        """
+        Creates a combatant from PokeAPI Pokémon data and its attacks.
+
+        Args:
+        - pokemon (dict): The Pokémon data.
+        - attacks (List[dict]): The attack details returned by GetData.attacks.
+
+        Returns:
+        - Combatant: The combatant.
+        """
+        def number(value) -> Optional[int]:
+            return value if isinstance(value, int) else None  # 'N/A' when move details could not be fetched
+
+        return cls(
+            id=pokemon['id'],
+            name=pokemon['name'],
+            hp=pokemon['stats'][0]['base_stat'],
+            attack=pokemon['stats'][1]['base_stat'],
+            defense=pokemon['stats'][2]['base_stat'],
+            moves=tuple(Move(attack['name'], number(attack['power']), number(attack['accuracy'])) for attack in attacks),
+        )
+
+
+@dataclass(slots=True)
+class BattleResult:
+    """The outcome of a single battle. winner is USER, OPPONENT or None for a draw."""
+    winner: Optional[int]
+    turns: int
+    user_hp: int
+    opponent_hp: int
+
+
+@dataclass(slots=True)
+class SimulationSummary:
+    """Aggregated outcomes of many battles between the same two combatants."""
+    battles: int = 0
+    user_wins: int = 0
+    opponent_wins: int = 0
+    draws: int = 0
+    turns: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        """The fraction of battles won by the user's Pokémon."""
+        return self.user_wins / self.battles if self.battles else 0.0
+
+    @property
+    def mean_turns(self) -> float:
+        """The average number of turns per battle."""
+        return self.turns / self.battles if self.battles else 0.0
+
+
+class BattleEngine:
+    """
+    Runs battles between two Pokémon without Streamlit, following the rules of the app.
+
+    Each turn the user's Pokémon attacks first and, if the opponent is still standing, the opponent
+    answers with a random move. Damage uses the same formula as GetData.calculate_damage and every
+    random choice comes from a single seeded generator, so a given seed always replays the same battles.
+    """
+
+    def __init__(self, user: Combatant, opponent: Combatant, seed: Optional[int] = None,
+                 user_move: Optional[int] = None, level: int = LEVEL, modifier: float = MODIFIER, max_turns: int = 1000):
+        """
+        Args:
+        - user (Combatant): The user's Pokémon.
+        - opponent (Combatant): The opponent Pokémon.
+        - seed (int or None): Seed for the random number generator.
+        - user_move (int or None): Index of the move the user always picks, or None to pick at random.
+        - level (int): Level of both Pokémon.
+        - modifier (float): Additional modifier for damage calculation.
+        - max_turns (int): Number of turns after which a battle is declared a draw.
+        """
+        self.user = user
+        self.opponent = opponent
+        self.rng = random.Random(seed)
+        self.max_turns = max_turns
+        # Precompute (hit chance, damage on hit) per move so a turn costs two random draws
+        user_moves = self._move_table(user, opponent, level, modifier)
+        if user_move is not None:
+            user_moves = user_moves[user_move:user_move + 1]
+        self._user_moves = user_moves
+        self._opponent_moves = self._move_table(opponent, user, level, modifier)
+
+    @staticmethod
+    def _move_table(attacker: Combatant, defender: Combatant, level: int, modifier: float) -> List[Tuple[float, int]]:
+        return [
+            (hit_chance(move.accuracy), hit_damage(level, attacker.attack, defender.defense, move.power, modifier))
+            for move in attacker.moves
+        ]
+
+    def run(self) -> BattleResult:
+        """
+        Runs a single battle to completion.
+
+        Returns:
+        - BattleResult: The outcome of the battle.
+        """
+        rand = self.rng.random
+        user_moves, opponent_moves = self._user_moves, self._opponent_moves
+        n_user, n_opponent = len(user_moves), len(opponent_moves)
+        user_hp, opponent_hp = self.user.hp, self.opponent.hp
+        for turn in range(1, self.max_turns + 1):
+            if n_user:
+                chance, damage = user_moves[int(rand() * n_user)]
+                if rand() < chance:
+                    opponent_hp -= damage
+                    if opponent_hp <= 0:
+                        return BattleResult(USER, turn, user_hp, 0)
+            if n_opponent:
+                chance, damage = opponent_moves[int(rand() * n_opponent)]
+                if rand() < chance:
+                    user_hp -= damage
+                    if user_hp <= 0:
+                        return BattleResult(OPPONENT, turn, 0, opponent_hp)
+        return BattleResult(None, self.max_turns, user_hp, opponent_hp)
+
+    def simulate(self, n_battles: int) -> SimulationSummary:
+        """
+        Runs many independent battles and aggregates their outcomes.
+
+        Args:
+        - n_battles (int): Number of battles to run.
+
+        Returns:
+        - SimulationSummary: The aggregated outcomes.
+        """
+        wins = [0, 0]
+        draws = turns = 0
+        run = self.run
+        for _ in range(n_battles):
+            result = run()
+            turns += result.turns
+            if result.winner is None:
+                draws += 1
+            else:
+                wins[result.winner] += 1
+        return SimulationSummary(n_battles, wins[USER], wins[OPPONENT], draws, turns)
@@ -0,0 +1,234 @@
+import dataclasses
+import os
+import random
+import secrets
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+from classes import PROJECT_ROOT
+from classes.lru_cache import LRUCache
+
+
+DEFAULT_PATH = os.path.join(PROJECT_ROOT, ".cache", "battles.sqlite3")
+# Battles not updated for this many seconds are deleted from the SQLite store
+DEFAULT_MAX_AGE = 7 * 24 * 3600
+
+
+def new_seed() -> int:
+    """Returns a random seed for a battle, small enough to store as a SQLite integer."""
+    return random.getrandbits(63)
+
+
+@dataclass(frozen=True, slots=True)
+class BattleRecord:
+    """
+    The state of one battle: Pokémon numbers, remaining health, turn count and random seed.
+
+    Pokémon data is not stored; it is resolved from the numbers through the shared caches.
+    user_hp and opponent_hp are None until the corresponding Pokémon has been sent out. turn and
+    seed restart whenever a Pokémon or its health changes outside a turn, so every stretch of turns
+    can be replayed from its seed. version counts the updates made to the record and never restarts.
+    """
+    battle_id: str
+    user_id: int
+    opponent_id: Optional[int] = None
+    user_hp: Optional[int] = None
+    opponent_hp: Optional[int] = None
+    turn: int = 0
+    seed: int = 0
+    in_progress: bool = False
+    updated: float = 0.0
+    version: int = 0
+
+
+class BattleStore:
+    """
+    Thread-safe in-memory store of battle records shared by every session of the process.
+
+    Records are immutable and replaced whole, so readers never see a half-applied turn. The store
+    keeps at most max_battles records, evicting the least recently used.
+    """
+
+    def __init__(self, max_battles: int = 10_000):
+        """
+        Args:
+        - max_battles (int): Maximum number of battles kept.
+        """
+        self._records = LRUCache(maxsize=max_battles)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def from_env() -> "BattleStore":
+        """
+        Creates a store configured from environment variables.
+
+        - POKEMON_BATTLE_DB: location of a SQLite database to keep battles in, so they survive restarts
+          and are shared between worker processes. Battles are kept in memory when unset.
+
+        Returns:
+        - BattleStore: The configured store.
+        """
+        path = os.environ.get("POKEMON_BATTLE_DB")
+        return SQLiteBattleStore(path) if path else BattleStore()
+
+    def get(self, battle_id: str) -> Optional[BattleRecord]:
+        """
+        Returns a battle record.
+
+        Args:
+        - battle_id (str): The battle id.
+
+        Returns:
+        - BattleRecord or None: The record, or None if the battle does not exist.
+        """
+        return self._records.get(battle_id)
+
+    def put(self, record: BattleRecord) -> None:
+        """
+        Stores a battle record, replacing any previous record with the same id.
+
+        Args:
+        - record (BattleRecord): The record to store.
+        """
+        self._records.put(record.battle_id, record)
+
+    def create(self, user_id: int) -> BattleRecord:
+        """
+        Creates and stores a new battle with a unique id and random seed.
+
+        Args:
+        - user_id (int): Number of the user's Pokémon.
+
+        Returns:
+        - BattleRecord: The new record.
+        """
+        record = BattleRecord(battle_id=secrets.token_urlsafe(12), user_id=user_id, seed=new_seed(), updated=time.time())
+        self.put(record)
+        return record
+
+    def update(self, battle_id: str, expected_version: Optional[int] = None, **changes) -> Optional[BattleRecord]:
+        """
+        Atomically replaces fields of a stored battle record and increments its version.
+
+        With expected_version this is a compare-and-set: the record is only changed if no update has
+        been made since the caller read it. The version never restarts, unlike turn, so a record that
+        was reset and played back to the same turn is still told apart.
+
+        Args:
+        - battle_id (str): The battle id.
+        - expected_version (int or None): Version the stored record must be on, or None to update unconditionally.
+        - **changes: New values for BattleRecord fields.
+
+        Returns:
+        - BattleRecord or None: The updated record, or None if the stored record has changed since it was read.
+
+        Raises:
+        - KeyError: If the battle does not exist.
+        """
+        with self._lock:
+            record = self.get(battle_id)
+            if record is None:
+                raise KeyError(battle_id)
+            if expected_version is not None and record.version != expected_version:
+                return None
+            record = dataclasses.replace(record, **changes, updated=time.time(), version=record.version + 1)
+            self.put(record)
+        return record
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+
+class SQLiteBattleStore(BattleStore):
+    """
+    Battle store kept in a SQLite database, one compact row of integers per battle.
+
+    Battles survive process restarts and can be resumed from any worker sharing the database file.
+    Battles not updated for max_age seconds are deleted as new ones are created.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, max_age: float = DEFAULT_MAX_AGE):
+        """
+        Args:
+        - path (str): Location of the SQLite database file.
+        - max_age (float): Age in seconds after which idle battles are deleted.
+        """
+        self.path = path
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS battles ("
+            "battle_id TEXT PRIMARY KEY, user_id INTEGER NOT NULL, opponent_id INTEGER, user_hp INTEGER, "
+            "opponent_hp INTEGER, turn INTEGER NOT NULL, seed INTEGER NOT NULL, in_progress INTEGER NOT NULL, "
+            "updated REAL NOT NULL, version INTEGER NOT NULL DEFAULT 0)"
+        )
+        if "version" not in {row[1] for row in self._conn.execute("PRAGMA table_info(battles)")}:
+            self._conn.execute("ALTER TABLE battles ADD COLUMN version INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS battles_updated ON battles (updated)")
+
+    def _get(self, battle_id: str) -> Optional[BattleRecord]:
+        row = self._conn.execute(
+            "SELECT battle_id, user_id, opponent_id, user_hp, opponent_hp, turn, seed, in_progress, updated, version "
+            "FROM battles WHERE battle_id = ?", (battle_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        *fields, in_progress, updated, version = row
+        return BattleRecord(*fields, in_progress=bool(in_progress), updated=updated, version=version)
+
+    def _put(self, record: BattleRecord) -> None:
+        self._conn.execute(
+            "INSERT OR REPLACE INTO battles (battle_id, user_id, opponent_id, user_hp, opponent_hp, turn, seed, in_progress, updated, version) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (record.battle_id, record.user_id, record.opponent_id, record.user_hp, record.opponent_hp,
+             record.turn, record.seed, int(record.in_progress), record.updated, record.version),
+        )
+
+    def get(self, battle_id: str) -> Optional[BattleRecord]:
+        with self._lock:
+            return self._get(battle_id)
+
+    def put(self, record: BattleRecord) -> None:
+        with self._lock:
+            self._put(record)
+
+    def create(self, user_id: int) -> BattleRecord:
+        with self._lock:
+            self._conn.execute("DELETE FROM battles WHERE updated < ?", (time.time() - self.max_age,))
+        return super().create(user_id)
+
+    def update(self, battle_id: str, expected_version: Optional[int] = None, **changes) -> Optional[BattleRecord]:
+        # The read, version check and write share one write transaction, so workers sharing the file cannot interleave
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                record = self._get(battle_id)
+                if record is None:
+                    raise KeyError(battle_id)
+                if expected_version is not None and record.version != expected_version:
+                    record = None
+                else:
+                    record = dataclasses.replace(record, **changes, updated=time.time(), version=record.version + 1)
+                    self._put(record)
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._conn.execute("COMMIT")
+        return record
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM battles").fetchone()[0]
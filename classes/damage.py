@@ -0,0 +1,133 @@
+import random
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from numpy.typing import ArrayLike
+
+
+def hit_damage(level: int, attack: int, defense: int, base: Optional[int], modifier: float) -> int:
+    """
+    Calculates the damage dealt by an attack that hits.
+
+    Args:
+    - level (int): Level of the attacking Pokémon
+    - attack (int): Attack stat of the attacking Pokémon
+    - defense (int): Defense stat of the defending Pokémon
+    - base (int or None): The base power of the attack.
+    - modifier (float): Additional modifier for damage calculation.
+
+    Returns:
+    - int: The damage value.
+    """
+    if base is None:
+        base = 0  # Set a default value if base power is not available
+    if defense == 0:
+        defense = 1  # Avoid division by zero
+    return int((((2 * level + 10) / 250) * (attack / defense) * base + 2) * modifier)
+
+
+def hit_chance(accuracy: Optional[int]) -> float:
+    """
+    Returns the probability in [0, 1] that a move with the given accuracy hits.
+
+    Args:
+    - accuracy (int or None): Accuracy of the move
+
+    Returns:
+    - float: The hit probability.
+    """
+    if accuracy is None:
+        accuracy = 100  # Moves without an accuracy value always hit
+    return min(max(accuracy, 0), 100) / 100
+
+
+def roll_hit(accuracy: Optional[int], rng: Optional[random.Random] = None) -> bool:
+    """
+    Rolls whether a move with the given accuracy hits.
+
+    Args:
+    - accuracy (int or None): Accuracy of the move
+    - rng (random.Random or None): Random number generator for the roll. Defaults to the global one.
+
+    Returns:
+    - bool: Whether the move hits.
+    """
+    if accuracy is None:
+        accuracy = 100  # Set a default value if accuracy is not available
+    return (rng or random).randint(1, 100) <= accuracy
+
+
+def calculate_damage(level: int, attack: int, defense: int, base: Optional[int], accuracy: Optional[int], modifier: float,
+                     rng: Optional[random.Random] = None) -> int:
+    """
+    Rolls for a hit and calculates the damage dealt by an attack.
+
+    Args:
+    - level (int): Level of the attacking Pokémon
+    - attack (int): Attack stat of the attacking Pokémon
+    - defense (int): Defense stat of the defending Pokémon
+    - base (int or None): The base power of the attack.
+    - accuracy (int or None): Accuracy of the move
+    - modifier (float): Additional modifier for damage calculation.
+    - rng (random.Random or None): Random number generator for the accuracy roll. Defaults to the global one.
+
+    Returns:
+    - int: The calculated damage value, 0 if the move misses.
+    """
+    if roll_hit(accuracy, rng):
+        # If the move hits
+        return hit_damage(level, attack, defense, base, modifier)
+    # If the move misses
+    return 0
+
+
+def hit_damage_batch(level: ArrayLike, attack: ArrayLike, defense: ArrayLike, base: ArrayLike, modifier: ArrayLike) -> np.ndarray:
+    """
+    Vectorised counterpart of hit_damage for arrays of attacks.
+
+    Arguments broadcast against each other. None or NaN base powers count as 0 and zero defense as 1,
+    and the formula is evaluated in the same order as hit_damage so every element matches it exactly.
+
+    Args:
+    - level (array-like): Levels of the attacking Pokémon
+    - attack (array-like): Attack stats of the attacking Pokémon
+    - defense (array-like): Defense stats of the defending Pokémon
+    - base (array-like): Base powers of the attacks.
+    - modifier (array-like): Additional modifiers for damage calculation.
+
+    Returns:
+    - np.ndarray: The damage values as int64.
+    """
+    base = np.nan_to_num(np.asarray(base, dtype=float), nan=0.0)
+    defense = np.asarray(defense, dtype=float)
+    defense = np.where(defense == 0, 1.0, defense)
+    level = np.asarray(level, dtype=float)
+    damage = (((2 * level + 10) / 250) * (np.asarray(attack, dtype=float) / defense) * base + 2) * np.asarray(modifier, dtype=float)
+    return np.trunc(damage).astype(np.int64)
+
+
+def calculate_damage_batch(level: ArrayLike, attack: ArrayLike, defense: ArrayLike, base: ArrayLike, accuracy: ArrayLike,
+                           modifier: ArrayLike, rng: Union[np.random.Generator, int, None] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Vectorised counterpart of calculate_damage that rolls for hits and calculates damage for arrays of attacks.
+
+    Each element rolls an integer in [1, 100] and hits when the roll is at most its accuracy, as in
+    calculate_damage. None or NaN accuracies count as 100.
+
+    Args:
+    - level (array-like): Levels of the attacking Pokémon
+    - attack (array-like): Attack stats of the attacking Pokémon
+    - defense (array-like): Defense stats of the defending Pokémon
+    - base (array-like): Base powers of the attacks.
+    - accuracy (array-like): Accuracies of the moves
+    - modifier (array-like): Additional modifiers for damage calculation.
+    - rng (np.random.Generator, int or None): Generator or seed for the accuracy rolls.
+
+    Returns:
+    - Tuple[np.ndarray, np.ndarray]: The boolean hit mask and the damage values (0 where the move misses).
+    """
+    damage = hit_damage_batch(level, attack, defense, base, modifier)
+    accuracy = np.nan_to_num(np.asarray(accuracy, dtype=float), nan=100.0)
+    damage, accuracy = np.broadcast_arrays(damage, accuracy)
+    hits = np.random.default_rng(rng).integers(1, 101, size=damage.shape) <= accuracy
+    return hits, np.where(hits, damage, 0)
@@ -0,0 +1,226 @@
+import argparse
+import copy
+import gzip
+import json
+import os
+from typing import Dict, List, Optional, Union
+
+from classes import PROJECT_ROOT
+
+
+FORMAT = "pokemon-battle-simulator/gen1"
+FORMAT_VERSION = 1
+DEFAULT_PATH = os.path.join(PROJECT_ROOT, "data", "gen1.json.gz")
+
+
+class Dataset:
+    """
+    Read-only Gen-1 dataset loaded from a compact, versioned bundle file.
+
+    The bundle is gzip-compressed JSON holding columnar arrays: one list per Pokémon field and
+    one list per move field, with each Pokémon's red-blue learnset stored as indices into the
+    move columns. Lookups by number or name are dictionary hits with no network I/O.
+    """
+
+    def __init__(self, bundle: dict):
+        """
+        Args:
+        - bundle (dict): The decoded bundle contents.
+        """
+        if bundle.get("format") != FORMAT or bundle.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported dataset bundle: {bundle.get('format')} v{bundle.get('version')}")
+        self.version_group = bundle["version_group"]
+        self.stat_names = bundle["stat_names"]
+        self._pokemon = bundle["pokemon"]
+        self._moves = bundle["moves"]
+        self.names: List[str] = self._pokemon["name"]
+        self._rows: Dict[Union[int, str], int] = {}
+        for row, (number, name) in enumerate(zip(self._pokemon["id"], self.names)):
+            self._rows[number] = row
+            self._rows[name] = row
+        self._records: Dict[int, dict] = {}
+        self._attacks: Dict[int, List[dict]] = {}
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> "Dataset":
+        """
+        Loads a dataset bundle from disk.
+
+        Args:
+        - path (str): Location of the bundle file.
+
+        Returns:
+        - Dataset: The loaded dataset.
+        """
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    @classmethod
+    def from_env(cls) -> Optional["Dataset"]:
+        """
+        Loads the bundle named by the POKEMON_DATASET environment variable, or the default bundle.
+
+        Returns:
+        - Dataset or None: The loaded dataset, or None if no bundle file exists.
+        """
+        path = os.environ.get("POKEMON_DATASET", DEFAULT_PATH)
+        if not path or not os.path.exists(path):
+            return None
+        return cls.load(path)
+
+    def _row(self, key: Union[int, str]) -> Optional[int]:
+        if isinstance(key, str) and key.isdigit():
+            key = int(key)
+        return self._rows.get(key)
+
+    def __contains__(self, key: Union[int, str]) -> bool:
+        return self._row(key) is not None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def get_pokemon(self, key: Union[int, str]) -> Optional[dict]:
+        """
+        Returns a Pokémon record shaped like the PokeAPI /pokemon response.
+
+        Only the fields used by the app are included; moves are limited to the bundled version group.
+        Records are built once and cached; each call gets its own copy, so callers may modify it freely.
+
+        Args:
+        - key (int or str): The Pokémon number or name.
+
+        Returns:
+        - dict or None: The Pokémon data, or None if it is not in the bundle.
+        """
+        row = self._row(key)
+        if row is None:
+            return None
+        if row not in self._records:
+            columns = self._pokemon
+            version_group = {"version_group": {"name": self.version_group}}
+            self._records[row] = {
+                "id": columns["id"][row],
+                "name": columns["name"][row],
+                "height": columns["height"][row],
+                "weight": columns["weight"][row],
+                "sprites": {
+                    "front_default": columns["front_default"][row],
+                    "back_default": columns["back_default"][row],
+                },
+                "stats": [
+                    {"base_stat": base_stat, "stat": {"name": name}}
+                    for name, base_stat in zip(self.stat_names, columns["stats"][row])
+                ],
+                "moves": [
+                    {"move": {"name": self._moves["name"][i], "url": self._moves["url"][i]}, "version_group_details": [version_group]}
+                    for i in columns["moves"][row]
+                ],
+            }
+        return copy.deepcopy(self._records[row])
+
+    def attacks(self, key: Union[int, str]) -> Optional[List[dict]]:
+        """
+        Returns the learnset of a Pokémon with move details.
+
+        Learnsets are built once and cached; each call gets its own copy, so callers may modify it freely.
+
+        Args:
+        - key (int or str): The Pokémon number or name.
+
+        Returns:
+        - List[dict] or None: Dictionaries of name, power, accuracy and pp, or None if the Pokémon is not in the bundle.
+        """
+        row = self._row(key)
+        if row is None:
+            return None
+        if row not in self._attacks:
+            moves = self._moves
+            self._attacks[row] = [
+                {"name": moves["name"][i], "power": moves["power"][i], "accuracy": moves["accuracy"][i], "pp": moves["pp"][i]}
+                for i in self._pokemon["moves"][row]
+            ]
+        return copy.deepcopy(self._attacks[row])
+
+
+def build(path: str = DEFAULT_PATH, limit: int = 151, version_group: str = "red-blue") -> dict:
+    """
+    Downloads the Gen-1 roster, learnsets and move data once and writes them to a bundle file.
+
+    Args:
+    - path (str): Location to write the bundle to.
+    - limit (int): Number of Pokémon to include, starting from number 1.
+    - version_group (str): Version group whose learnsets are bundled.
+
+    Returns:
+    - dict: The bundle contents.
+    """
+    from classes.get_data import GetData
+
+    GetData.dataset = None  # Always build from PokeAPI, never from a previous bundle
+    listing = GetData.fetch_data(f"{GetData.base_url}/pokemon?limit={limit}")
+    if not listing:
+        raise RuntimeError("Could not fetch the Pokémon list")
+
+    pokemon_columns = {key: [] for key in ("id", "name", "height", "weight", "front_default", "back_default", "stats", "moves")}
+    move_index: Dict[str, int] = {}
+    move_names: List[str] = []
+    move_urls: List[str] = []
+    stat_names: List[str] = []
+    for entry in listing["results"]:
+        pokemon = GetData.fetch_data(entry["url"])
+        if not pokemon:
+            raise RuntimeError(f"Could not fetch {entry['name']}")
+        stat_names = stat_names or [stat["stat"]["name"] for stat in pokemon["stats"]]
+        learnset = []
+        for move in pokemon["moves"]:
+            if any(vg["version_group"]["name"] == version_group for vg in move["version_group_details"]):
+                url = move["move"]["url"]
+                if url not in move_index:
+                    move_index[url] = len(move_urls)
+                    move_urls.append(url)
+                    move_names.append(move["move"]["name"])
+                learnset.append(move_index[url])
+        pokemon_columns["id"].append(pokemon["id"])
+        pokemon_columns["name"].append(pokemon["name"])
+        pokemon_columns["height"].append(pokemon["height"])
+        pokemon_columns["weight"].append(pokemon["weight"])
+        pokemon_columns["front_default"].append(pokemon["sprites"]["front_default"])
+        pokemon_columns["back_default"].append(pokemon["sprites"]["back_default"])
+        pokemon_columns["stats"].append([stat["base_stat"] for stat in pokemon["stats"]])
+        pokemon_columns["moves"].append(learnset)
+
+    details = GetData.get_moves_details(move_urls)
+    missing = [name for name, detail in zip(move_names, details) if detail == ('N/A', 'N/A', 'N/A')]
+    if missing:
+        raise RuntimeError(f"Could not fetch moves: {', '.join(missing)}")
+    bundle = {
+        "format": FORMAT,
+        "version": FORMAT_VERSION,
+        "version_group": version_group,
+        "stat_names": stat_names,
+        "pokemon": pokemon_columns,
+        "moves": {
+            "name": move_names,
+            "url": move_urls,
+            "power": [power for power, _, _ in details],
+            "accuracy": [accuracy for _, accuracy, _ in details],
+            "pp": [pp for _, _, pp in details],
+        },
+    }
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump(bundle, f, separators=(",", ":"))
+    return bundle
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the compact Gen-1 dataset bundle from PokeAPI.")
+    parser.add_argument("command", choices=["build"])
+    parser.add_argument("--out", default=DEFAULT_PATH, help="Location to write the bundle to.")
+    parser.add_argument("--limit", type=int, default=151, help="Number of Pokémon to include.")
+    parser.add_argument("--version-group", default="red-blue", help="Version group whose learnsets are bundled.")
+    args = parser.parse_args()
+    bundle = build(args.out, args.limit, args.version_group)
+    print(f"Wrote {len(bundle['pokemon']['id'])} Pokémon and {len(bundle['moves']['name'])} moves to {args.out}")
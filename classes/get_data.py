@@ -1,14 +1,93 @@
 import streamlit as st
 import requests
+import os
 import random
-from typing import Optional, List, Tuple, Union
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+from typing import Any, Callable, Optional, List, Tuple, Union
+
+from classes import damage, pokedex
+from classes.asset_cache import AssetCache, cry_url
+from classes.dataset import Dataset
+from classes.http_client import HttpClient
+from classes.lru_cache import LRUCache
+from classes.profiling import profiler
+from classes.response_cache import ResponseCache
+
+
+class _LazyAttribute:
+    """
+    Class attribute created by a factory on first access and then stored in its place.
+
+    Keeps importing GetData free of side effects such as creating cache files or opening database
+    connections; tools that never use a resource never create it. Assigning the attribute first
+    replaces the factory altogether.
+    """
+    _lock = threading.RLock()
+
+    def __init__(self, factory: Callable[[], Any]):
+        """
+        Args:
+        - factory (Callable): Function returning the attribute value.
+        """
+        self.factory = factory
+
+    def __set_name__(self, owner: type, name: str) -> None:
+        self.name = name
+
+    def __get__(self, instance: Any, owner: type) -> Any:
+        with self._lock:
+            if owner.__dict__.get(self.name) is not self:
+                return owner.__dict__[self.name]  # Created by another thread meanwhile
+            value = self.factory()
+            setattr(owner, self.name, value)
+            return value
+
+
+def _create_http_client() -> HttpClient:
+    client = HttpClient.from_env()
+    profiler.register_collector("http", client.metrics, counters=("requests", "coalesced", "errors", "latency_total"))
+    return client
+
+
+def _create_asset_cache() -> Optional[AssetCache]:
+    cache = AssetCache.from_env(GetData.http_client)
+    if cache:
+        profiler.register_collector("asset_cache", cache.memory.stats, counters=("hits", "misses"))
+    return cache
+
 
 class GetData:
+    # Root of the PokeAPI endpoints, e.g. a local stand-in server started with `python -m classes.local_pokeapi`
+    base_url: str = os.environ.get("POKEAPI_BASE_URL", "https://pokeapi.co/api/v2").rstrip("/")
+    # Roster covers every Pokémon up to this generation (1-9); moves are those learnt in version_group
+    generation: int = int(os.environ.get("POKEMON_GENERATION", "1"))
+    version_group: str = os.environ.get("POKEMON_VERSION_GROUP", "red-blue")
+    # Upper bound on concurrent PokeAPI requests made when resolving a moveset
+    max_workers: int = 8
+    # The clients, caches and bundle below are created from the environment on first use
+    # Pooled keep-alive HTTP client with timeouts, retries and request coalescing
+    http_client: HttpClient = _LazyAttribute(_create_http_client)
+    # Local store of sprites and cries served to the page as bytes (None when disabled)
+    asset_cache: Optional[AssetCache] = _LazyAttribute(_create_asset_cache)
+    # Persistent PokeAPI response cache shared by every session (None when disabled)
+    response_cache: Optional[ResponseCache] = _LazyAttribute(ResponseCache.from_env)
+    # Prebuilt Gen-1 bundle used instead of PokeAPI when present (None when not built)
+    dataset: Optional[Dataset] = _LazyAttribute(Dataset.from_env)
+    # Resolved Pokémon and movesets shared by every session, evicted least-recently-used
+    pokemon_cache: LRUCache = LRUCache(maxsize=256)
+    attacks_cache: LRUCache = LRUCache(maxsize=256)
+    # Power, accuracy and PP per move URL, so moves shared across the roster are decoded once
+    move_cache: LRUCache = LRUCache(maxsize=1024)
+    # Number of resolved Pokémon and movesets each session keeps for itself
+    session_cache_size: int = 8
 
     @staticmethod
     def fetch_data(url: str) -> Optional[dict]:
         """
-        Fetches data from a given URL and returns it as JSON.
+        Fetches data from a given URL and returns it as JSON, serving it from the response cache when possible.
 
         Args:
         - url (str): The URL to fetch data from.
@@ -17,26 +96,78 @@ class GetData:
         - dict or None: The JSON data if successful, None if the request fails.
         """
         try:
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an exception for bad status codes
-            return response.json()
+            return GetData.download(url)
         except requests.exceptions.RequestException as e:
             st.error(f"Request failed: {e}")
             return None
 
     @staticmethod
-    def get_pokemon_data(number: int) -> Optional[dict]:
+    def download(url: str) -> dict:
+        """
+        Fetches JSON from a given URL through the response cache, raising on failure.
+
+        Args:
+        - url (str): The URL to fetch data from.
+
+        Returns:
+        - dict: The JSON data.
+
+        Raises:
+        - requests.exceptions.RequestException: If the request fails and no cached response is available.
+        """
+        start = time.perf_counter()
+        source = "error"
+        try:
+            cache = GetData.response_cache
+            if cache:
+                data = cache.get(url)
+                if data is not None:
+                    source = "cache"
+                    return data
+                if cache.offline:
+                    raise requests.exceptions.ConnectionError(f"Offline mode: no cached response for {url}")
+            try:
+                data = GetData.http_client.get_json(url)
+            except requests.exceptions.RequestException:
+                stale = cache.get(url, allow_stale=True) if cache else None
+                if stale is not None:
+                    source = "stale"
+                    return stale  # Fall back to an expired entry rather than failing
+                raise
+            if cache:
+                cache.put(url, data)
+            source = "network"
+            return data
+        finally:
+            profiler.record_fetch(url, time.perf_counter() - start, source)
+
+    @staticmethod
+    def uses_dataset() -> bool:
+        """Returns whether the dataset bundle covers the configured roster and version group."""
+        dataset = GetData.dataset
+        return bool(dataset) and dataset.version_group == GetData.version_group and len(dataset) >= pokedex.roster_size(GetData.generation)
+
+    @staticmethod
+    @profiler.timed("get_data.get_pokemon_data")
+    def get_pokemon_data(number: Union[int, str]) -> Optional[dict]:
         """
         Fetches Pokémon data from the PokeAPI based on the Pokémon number.
 
+        The response is reduced to a compact record with only the moves of the configured version group.
+
         Args:
-        - number (int): The Pokémon number.
+        - number (int or str): The Pokémon number or name.
 
         Returns:
         - dict or None: The Pokémon data if found, None if not found or request fails.
         """
-        url = f"https://pokeapi.co/api/v2/pokemon/{number}"
-        return GetData.fetch_data(url)
+        if GetData.uses_dataset() and number in GetData.dataset:
+            return GetData.dataset.get_pokemon(number)
+        url = f"{GetData.base_url}/pokemon/{number}"
+        data = GetData.fetch_data(url)
+        if data:
+            return pokedex.compact_pokemon(data, GetData.version_group)
+        return None
 
     @staticmethod
     def get_random_pokemon_name() -> Optional[str]:
@@ -46,14 +177,29 @@ class GetData:
         Returns:
         - str or None: The name of a random Pokémon if successful, None if request fails.
         """
-        url = "https://pokeapi.co/api/v2/pokemon?limit=151"
-        data = GetData.fetch_data(url)
-        if data:
-            pokemon_list = data['results']
-            random_pokemon = random.choice(pokemon_list)
-            return random_pokemon['name']
+        names = GetData.get_all_pokemon_names()
+        if names:
+            return random.choice(names)
         return None
 
+    @staticmethod
+    def asset(url: Optional[str]) -> Union[bytes, str, None]:
+        """
+        Returns a sprite or cry from the asset cache, falling back to its URL so the browser fetches it instead.
+
+        A missing asset is downloaded into the cache in the background, so the script run never waits on it.
+
+        Args:
+        - url (str or None): The asset URL.
+
+        Returns:
+        - bytes, str or None: The asset bytes if available, otherwise the URL.
+        """
+        if not url or GetData.asset_cache is None:
+            return url
+        data = GetData.asset_cache.get(url, download=False)
+        return url if data is None else data
+
     @staticmethod
     def display_pokemon_data(pokemon: Optional[dict], title: str, appearance: str, fight: bool) -> Tuple[int, List]:
         """
@@ -70,11 +216,12 @@ class GetData:
         """
         if pokemon:
             st.subheader(title)
-            audio_url = f"https://veekun.com/dex/media/pokemon/cries/{pokemon['id']}.ogg"
+            cry = GetData.asset(cry_url(pokemon['id']))
+            sprite = GetData.asset(pokemon["sprites"][f"{appearance}_default"])
             if fight == False:
                 col1, col2 = st.columns(2)
                 with col1:
-                    st.image(pokemon["sprites"][f"{appearance}_default"], width=150)
+                    st.image(sprite, width=150)
                     st.write(f"**Number:** {pokemon['id']}")
                     st.write(f"**Name:** {pokemon['name'].capitalize()}")
                     st.write(f"**Height:** {pokemon['height']/10} metres")
@@ -83,10 +230,10 @@ class GetData:
                     st.write("**Stats:**")
                     for stat in pokemon["stats"]:
                         st.write(f"- {stat['stat']['name'].capitalize()}: {stat['base_stat']}")
-                st.audio(audio_url, format='audio/ogg')
+                st.audio(cry, format='audio/ogg')
             else:
-                st.image(pokemon["sprites"][f"{appearance}_default"], width=150)
-                st.audio(audio_url, format='audio/ogg')
+                st.image(sprite, width=150)
+                st.audio(cry, format='audio/ogg')
                 col1, col2 = st.columns(2)
                 with col1:
                     st.write(f"**Number:** {pokemon['id']}")
@@ -100,16 +247,18 @@ class GetData:
     @st.cache_data
     def get_all_pokemon_names() -> List[str]:
         """
-        Fetches all Pokémon names from the PokeAPI.
+        Fetches the names of every Pokémon up to the configured generation, streaming the paginated PokeAPI list.
 
         Returns:
-        - List[str]: A list of Pokémon names if successful, an empty list if request fails.
+        - List[str]: A list of Pokémon names in Pokédex order if successful, an empty list if request fails.
         """
-        url = "https://pokeapi.co/api/v2/pokemon?limit=151"
-        data = GetData.fetch_data(url)
-        if data:
-            return [pokemon['name'] for pokemon in data['results']]
-        return []
+        if GetData.uses_dataset():
+            return list(GetData.dataset.names[:pokedex.roster_size(GetData.generation)])
+        try:
+            return [name for _, name in pokedex.iter_resources(GetData.download, GetData.base_url, "pokemon", pokedex.roster_size(GetData.generation))]
+        except requests.exceptions.RequestException as e:
+            st.error(f"Request failed: {e}")
+            return []
 
     @staticmethod
     def get_move_details(move_url: str) -> Tuple[Union[int, str], Union[int, str], Union[int, str]]:
@@ -123,17 +272,42 @@ class GetData:
         - Tuple[int or str, int or str, int or str]: The power, accuracy, and PP of the move.
           Returns 'N/A' for each value if request fails or data is not available.
         """
+        details = GetData.move_cache.get(move_url)
+        if details is not None:
+            return details
         data = GetData.fetch_data(move_url)
         if data:
-            power = data.get('power', 'N/A')
-            accuracy = data.get('accuracy', 'N/A')
-            pp = data.get('pp', 'N/A')
-            return power, accuracy, pp
+            details = data.get('power', 'N/A'), data.get('accuracy', 'N/A'), data.get('pp', 'N/A')
+            GetData.move_cache.put(move_url, details)
+            return details
         return 'N/A', 'N/A', 'N/A'
 
+    @staticmethod
+    def get_moves_details(move_urls: List[str], max_workers: Optional[int] = None) -> List[Tuple[Union[int, str], Union[int, str], Union[int, str]]]:
+        """
+        Fetches move details for several move URLs concurrently.
+
+        Args:
+        - move_urls (List[str]): The URLs of the moves.
+        - max_workers (int or None): Maximum number of concurrent requests. Defaults to GetData.max_workers.
+
+        Returns:
+        - List[Tuple[int or str, int or str, int or str]]: The power, accuracy, and PP of each move,
+          in the same order as move_urls.
+        """
+        if not move_urls:
+            return []
+        workers = min(max_workers or GetData.max_workers, len(move_urls))
+        # Attach the Streamlit script context to the worker threads so st.error still reaches the page
+        ctx = get_script_run_ctx(suppress_warning=True)
+        initializer = (lambda: add_script_run_ctx(ctx=ctx)) if ctx else None
+        with ThreadPoolExecutor(max_workers=workers, initializer=initializer) as executor:
+            return list(executor.map(GetData.get_move_details, move_urls))
+
+    @profiler.timed("get_data.attacks")
     def attacks(self, pokemon: dict) -> List[dict]:
         """
-        Retrieves attack details for a given Pokémon based on the "red-blue" version group.
+        Retrieves attack details for a given Pokémon based on the configured version group (default "red-blue").
 
         Args:
         - pokemon (dict): The Pokémon data.
@@ -141,14 +315,70 @@ class GetData:
         Returns:
         - List[dict]: A list of dictionaries containing attack details (name, power, accuracy, pp).
         """
-        attacks = []
+        if self.uses_dataset() and pokemon['id'] in self.dataset:
+            return self.dataset.attacks(pokemon['id'])
+        moves = []
         for move in pokemon['moves']:
-            version_group_details = next((vg for vg in move['version_group_details'] if vg['version_group']['name'] == 'red-blue'), None)
+            version_group_details = next((vg for vg in move['version_group_details'] if vg['version_group']['name'] == self.version_group), None)
             if version_group_details:
-                move_name = move['move']['name']
-                move_url = move['move']['url']
-                power, accuracy, pp = self.get_move_details(move_url)
-                attacks.append({'name': move_name, 'power': power, 'accuracy': accuracy, 'pp': pp})
+                moves.append(move['move'])
+        details = self.get_moves_details([move['url'] for move in moves])
+        return [
+            {'name': move['name'], 'power': power, 'accuracy': accuracy, 'pp': pp}
+            for move, (power, accuracy, pp) in zip(moves, details)
+        ]
+
+    @staticmethod
+    def _session_cache(name: str) -> LRUCache:
+        """Returns the per-session LRU cache stored in the Streamlit session state under the given name."""
+        if name not in st.session_state:
+            st.session_state[name] = LRUCache(maxsize=GetData.session_cache_size)
+        return st.session_state[name]
+
+    def resolve_pokemon(self, key: Union[int, str]) -> Optional[dict]:
+        """
+        Returns Pokémon data, memoized per session and per process so unchanged selections cost nothing on rerun.
+
+        Args:
+        - key (int or str): The Pokémon number or name.
+
+        Returns:
+        - dict or None: The Pokémon data if found, None if not found or request fails.
+        """
+        session_cache = self._session_cache('pokemon_memo')
+        pokemon = session_cache.get(key)
+        if pokemon is None:
+            pokemon = self.pokemon_cache.get(key)
+            if pokemon is None:
+                pokemon = self.get_pokemon_data(key)
+                if pokemon is None:
+                    return None  # Do not memoize failures so the next rerun retries
+                self.pokemon_cache.put(pokemon['id'], pokemon)
+                self.pokemon_cache.put(pokemon['name'], pokemon)
+            session_cache.put(key, pokemon)
+        return pokemon
+
+    def resolve_attacks(self, pokemon: dict) -> List[dict]:
+        """
+        Returns the attacks of a Pokémon, memoized per session and per process so each moveset is resolved once.
+
+        Args:
+        - pokemon (dict): The Pokémon data.
+
+        Returns:
+        - List[dict]: A list of dictionaries containing attack details (name, power, accuracy, pp).
+        """
+        session_cache = self._session_cache('attacks_memo')
+        key = pokemon['id']
+        attacks = session_cache.get(key)
+        if attacks is None:
+            attacks = self.attacks_cache.get(key)
+            if attacks is None:
+                attacks = self.attacks(pokemon)
+                if any(attack['power'] == 'N/A' for attack in attacks):
+                    return attacks  # Some moves failed to load; retry on the next rerun
+                self.attacks_cache.put(key, attacks)
+            session_cache.put(key, attacks)
         return attacks
 
     @staticmethod
@@ -167,15 +397,9 @@ class GetData:
         Returns:
         - int: The calculated damage value.
         """
-        if base is None:
-            base = 0  # Set a default value if base power is not available
-        if accuracy is None:
-            accuracy = 100  # Set a default value if base power is not available
-        if defense == 0:
-            defense = 1  # Avoid division by zero
-        if random.randint(1, 100) <= accuracy:
-            # If the move hits
-            return int((((2 * level + 10) / 250) * (attack / defense) * base + 2) * modifier)
-        else:
-            # If the move misses
-            return 0
\ No newline at end of file
+        return damage.calculate_damage(level, attack, defense, base, accuracy, modifier)
+
+
+profiler.register_collector("pokemon_cache", GetData.pokemon_cache.stats, counters=("hits", "misses"))
+profiler.register_collector("attacks_cache", GetData.attacks_cache.stats, counters=("hits", "misses"))
+profiler.register_collector("move_cache", GetData.move_cache.stats, counters=("hits", "misses"))
@@ -0,0 +1,153 @@
+import os
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class HttpClient:
+    """
+    Shared, thread-safe JSON and binary client with a pooled keep-alive session.
+
+    Requests time out instead of hanging, are retried with exponential backoff on 429 and 5xx
+    responses, and concurrent requests for the same URL are coalesced so only the first caller
+    goes to the network while the others wait for its result.
+    """
+
+    def __init__(self, pool_size: int = 32, timeout: Tuple[float, float] = (3.05, 10.0), retries: int = 3, backoff: float = 0.5):
+        """
+        Args:
+        - pool_size (int): Maximum number of kept-alive connections per host.
+        - timeout (Tuple[float, float]): Connect and read timeouts in seconds.
+        - retries (int): Number of retries on connection errors and 429/5xx responses.
+        - backoff (float): Backoff factor in seconds between retries.
+        """
+        self.timeout = timeout
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset({"GET"}),
+            respect_retry_after_header=True,
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+        self._adapters = (adapter,)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Tuple[str, bool], Future] = {}
+        self._stats = {"requests": 0, "coalesced": 0, "errors": 0, "latency_total": 0.0, "latency_max": 0.0}
+
+    @classmethod
+    def from_env(cls) -> "HttpClient":
+        """
+        Creates a client configured from environment variables.
+
+        - POKEAPI_POOL_SIZE: maximum number of kept-alive connections per host.
+        - POKEAPI_TIMEOUT: read timeout in seconds.
+        - POKEAPI_RETRIES: number of retries on failures.
+
+        Returns:
+        - HttpClient: The configured client.
+        """
+        return cls(
+            pool_size=int(os.environ.get("POKEAPI_POOL_SIZE", "32")),
+            timeout=(3.05, float(os.environ.get("POKEAPI_TIMEOUT", "10"))),
+            retries=int(os.environ.get("POKEAPI_RETRIES", "3")),
+        )
+
+    def get_json(self, url: str) -> dict:
+        """
+        Fetches a URL and returns its JSON body, sharing the request with concurrent callers of the same URL.
+
+        Args:
+        - url (str): The URL to fetch.
+
+        Returns:
+        - dict: The JSON data.
+
+        Raises:
+        - requests.exceptions.RequestException: If the request fails after retries.
+        """
+        return self._coalesced(url, binary=False)
+
+    def get_bytes(self, url: str) -> bytes:
+        """
+        Fetches a URL and returns its raw body, e.g. an image or sound, sharing the request with concurrent callers.
+
+        Args:
+        - url (str): The URL to fetch.
+
+        Returns:
+        - bytes: The response body.
+
+        Raises:
+        - requests.exceptions.RequestException: If the request fails after retries.
+        """
+        return self._coalesced(url, binary=True)
+
+    def _coalesced(self, url: str, binary: bool) -> Union[dict, bytes]:
+        key = (url, binary)
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self._in_flight[key] = Future()
+            else:
+                self._stats["coalesced"] += 1
+        if not leader:
+            return future.result()
+        try:
+            data = self._request(url, binary)
+            future.set_result(data)
+            return data
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def _request(self, url: str, binary: bool = False) -> Union[dict, bytes]:
+        start = time.perf_counter()
+        try:
+            response = self.session.get(url, timeout=self.timeout)
+            response.raise_for_status()  # Raise an exception for bad status codes
+            return response.content if binary else response.json()
+        except requests.exceptions.RequestException:
+            with self._lock:
+                self._stats["errors"] += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._stats["requests"] += 1
+                self._stats["latency_total"] += elapsed
+                self._stats["latency_max"] = max(self._stats["latency_max"], elapsed)
+
+    def metrics(self) -> Dict[str, float]:
+        """
+        Returns request, coalescing, latency and connection pool reuse metrics.
+
+        Returns:
+        - Dict[str, float]: The metrics. pool_reuse is the fraction of HTTP requests that reused a kept-alive connection.
+        """
+        connections = pool_requests = 0
+        for adapter in self._adapters:
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is not None:
+                    connections += pool.num_connections
+                    pool_requests += pool.num_requests
+        with self._lock:
+            stats = dict(self._stats)
+        stats["latency_mean"] = stats["latency_total"] / stats["requests"] if stats["requests"] else 0.0
+        stats["connections_opened"] = connections
+        stats["pool_reuse"] = 1 - connections / pool_requests if pool_requests else 0.0
+        return stats
@@ -0,0 +1,287 @@
+import argparse
+import gzip
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from classes import pokedex
+
+
+FIXTURES_FORMAT = "pokemon-battle-simulator/pokeapi-fixtures"
+FIXTURES_VERSION = 1
+# Base URL that recorded fixtures refer to; rewritten to the local server's address when served
+RECORDED_BASE_URL = "https://pokeapi.co/api/v2"
+STAT_NAMES = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+
+
+def synthetic_fixtures(n_pokemon: int = 151, n_moves: int = 165, moves_per_pokemon: int = 40, seed: int = 0) -> Dict[str, Dict[str, dict]]:
+    """
+    Generates a deterministic fixture set of made-up Pokémon and moves in PokeAPI shapes.
+
+    Args:
+    - n_pokemon (int): Number of Pokémon.
+    - n_moves (int): Number of distinct moves.
+    - moves_per_pokemon (int): Number of red-blue moves each Pokémon learns.
+    - seed (int): Seed for the generated values.
+
+    Returns:
+    - Dict[str, Dict[str, dict]]: Pokémon and move responses keyed by endpoint and then id.
+    """
+    rng = random.Random(seed)
+    moves = {
+        str(m): {
+            "id": m, "name": f"move{m}", "power": rng.choice([None, 40, 60, 80, 120]),
+            "accuracy": rng.choice([None, 70, 85, 100]), "pp": rng.choice([5, 10, 20, 35]),
+        }
+        for m in range(1, n_moves + 1)
+    }
+    pokemon = {}
+    for i in range(1, n_pokemon + 1):
+        pokemon[str(i)] = {
+            "id": i, "name": f"stubmon{i}", "height": rng.randint(3, 90), "weight": rng.randint(10, 2000),
+            "sprites": {
+                "front_default": f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/{i}.png",
+                "back_default": f"https://raw.githubusercontent.com/PokeAPI/sprites/master/sprites/pokemon/back/{i}.png",
+            },
+            "stats": [{"base_stat": rng.randint(20, 150), "stat": {"name": stat}} for stat in STAT_NAMES],
+            "moves": [
+                {"move": {"name": f"move{m}", "url": f"{RECORDED_BASE_URL}/move/{m}/"},
+                 "version_group_details": [{"version_group": {"name": "red-blue"}}]}
+                for m in rng.sample(range(1, n_moves + 1), min(moves_per_pokemon, n_moves))
+            ],
+        }
+    return {"pokemon": pokemon, "move": moves}
+
+
+def record_fixtures(cache) -> Dict[str, Dict[str, dict]]:
+    """
+    Builds a fixture set from the Pokémon and move responses stored in a response cache.
+
+    Run `python -m classes.warmup` first so the cache holds the whole roster.
+
+    Args:
+    - cache (ResponseCache): The response cache to read.
+
+    Returns:
+    - Dict[str, Dict[str, dict]]: Pokémon and move responses keyed by endpoint and then id.
+    """
+    fixtures: Dict[str, Dict[str, dict]] = {"pokemon": {}, "move": {}}
+    for url, data in cache.items():
+        if not url.startswith(RECORDED_BASE_URL) or "?" in url:
+            continue  # List responses are generated from the recorded Pokémon
+        endpoint = url[len(RECORDED_BASE_URL):].strip("/").split("/")[0]
+        if endpoint in fixtures and "id" in data:
+            fixtures[endpoint][str(data["id"])] = data
+    return fixtures
+
+
+def seed_cache(cache, fixtures: Dict[str, Dict[str, dict]]) -> None:
+    """
+    Stores a fixture set in a response cache under the pokeapi.co URLs the app requests, for offline runs.
+
+    Args:
+    - cache (ResponseCache): The response cache to fill.
+    - fixtures (Dict[str, Dict[str, dict]]): Pokémon and move responses keyed by endpoint and then id.
+    """
+    roster = sorted(fixtures["pokemon"].values(), key=lambda pokemon: pokemon["id"])
+    for offset in range(0, len(roster), pokedex.PAGE_SIZE):
+        page = roster[offset:offset + pokedex.PAGE_SIZE]
+        following = offset + len(page)
+        cache.put(pokedex.list_url(RECORDED_BASE_URL, "pokemon", offset, len(page)), {
+            "count": len(roster),
+            "next": pokedex.list_url(RECORDED_BASE_URL, "pokemon", following, pokedex.PAGE_SIZE) if following < len(roster) else None,
+            "previous": None,
+            "results": [{"name": pokemon["name"], "url": f"{RECORDED_BASE_URL}/pokemon/{pokemon['id']}/"} for pokemon in page],
+        })
+    for pokemon in roster:
+        cache.put(f"{RECORDED_BASE_URL}/pokemon/{pokemon['id']}", pokemon)
+        cache.put(f"{RECORDED_BASE_URL}/pokemon/{pokemon['name']}", pokemon)
+    for move in fixtures["move"].values():
+        cache.put(f"{RECORDED_BASE_URL}/move/{move['id']}/", move)
+
+
+def save_fixtures(fixtures: Dict[str, Dict[str, dict]], path: str) -> None:
+    """Writes a fixture set to a gzip-compressed JSON file."""
+    with gzip.open(path, "wt", encoding="utf-8") as f:
+        json.dump({"format": FIXTURES_FORMAT, "version": FIXTURES_VERSION, **fixtures}, f, separators=(",", ":"))
+
+
+def load_fixtures(path: str) -> Dict[str, Dict[str, dict]]:
+    """Reads a fixture set written by save_fixtures."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        data = json.load(f)
+    if data.get("format") != FIXTURES_FORMAT or data.get("version") != FIXTURES_VERSION:
+        raise ValueError(f"Unsupported fixture file: {path}")
+    return {"pokemon": data["pokemon"], "move": data["move"]}
+
+
+class LocalPokeAPI:
+    """
+    Lightweight local stand-in for PokeAPI serving a fixture set, for load testing and offline runs.
+
+    Serves the /pokemon/{id or name}, /pokemon?limit=&offset= and /move/{id} shapes GetData consumes,
+    with URLs inside responses pointing back at this server. Every response can be delayed by a
+    configurable latency with jitter, and a fraction of requests can fail with 500 or 429 errors.
+    Use as a context manager, or call start() and stop().
+    """
+
+    def __init__(self, fixtures: Dict[str, Dict[str, dict]], host: str = "127.0.0.1", port: int = 0,
+                 latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0, seed: Optional[int] = None):
+        """
+        Args:
+        - fixtures (Dict[str, Dict[str, dict]]): Pokémon and move responses keyed by endpoint and then id.
+        - host (str): The interface to listen on.
+        - port (int): The port to listen on; 0 picks a free port.
+        - latency (float): Delay in seconds added to every response.
+        - jitter (float): Maximum extra random delay in seconds.
+        - error_rate (float): Fraction of requests answered with an error.
+        - seed (int or None): Seed for jitter and error injection.
+        """
+        self.fixtures = fixtures
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self.base_url = f"http://{host}:{self._server.server_port}/api/v2"
+        self._bodies: Dict[str, bytes] = {}
+        self._index()
+
+    def _index(self) -> None:
+        """Pre-encodes every response with URLs rewritten to this server."""
+        for endpoint, responses in self.fixtures.items():
+            for key, data in responses.items():
+                body = json.dumps(data, separators=(",", ":")).replace(RECORDED_BASE_URL, self.base_url).encode("utf-8")
+                self._bodies[f"{endpoint}/{key}"] = body
+                if "name" in data:
+                    self._bodies[f"{endpoint}/{data['name']}"] = body
+        ordered = sorted(self.fixtures.get("pokemon", {}).values(), key=lambda pokemon: pokemon["id"])
+        self._roster = [{"name": pokemon["name"], "url": f"{self.base_url}/pokemon/{pokemon['id']}/"} for pokemon in ordered]
+
+    def _list(self, endpoint: str, query: str) -> bytes:
+        """Renders a paginated list response like PokeAPI's."""
+        params = parse_qs(query)
+        limit = int(params.get("limit", ["20"])[0])
+        offset = int(params.get("offset", ["0"])[0])
+        page = self._roster[offset:offset + limit]
+        following = offset + limit
+        return json.dumps({
+            "count": len(self._roster),
+            "next": f"{self.base_url}/{endpoint}?offset={following}&limit={limit}" if following < len(self._roster) else None,
+            "previous": f"{self.base_url}/{endpoint}?offset={max(offset - limit, 0)}&limit={limit}" if offset > 0 else None,
+            "results": page,
+        }).encode("utf-8")
+
+    def respond(self, path: str) -> Tuple[int, bytes]:
+        """
+        Returns the status code and body for a request path, applying latency and error injection.
+
+        Args:
+        - path (str): The request path and query, e.g. "/api/v2/move/33/".
+
+        Returns:
+        - Tuple[int, bytes]: The status code and JSON body.
+        """
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._rng.random() * self.jitter
+            error = None
+            if self._rng.random() < self.error_rate:
+                self.errors += 1
+                error = (429, b'{"detail":"Rate limited"}') if self._rng.random() < 0.5 else (500, b'{"detail":"Injected error"}')
+        if delay:
+            time.sleep(delay)
+        if error:
+            return error
+        parts = urlsplit(path)
+        match = re.fullmatch(r"/api/v2/(\w+)/?(?:([\w-]+)/?)?", parts.path)
+        if not match:
+            return 404, b'{"detail":"Not found."}'
+        endpoint, key = match.groups()
+        if key is None and endpoint == "pokemon":
+            return 200, self._list(endpoint, parts.query)
+        body = self._bodies.get(f"{endpoint}/{key}")
+        return (200, body) if body is not None else (404, b'{"detail":"Not found."}')
+
+    def _handler(self) -> type:
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # Keep-alive, like pokeapi.co
+            disable_nagle_algorithm = True  # Headers and body are separate writes; avoid delayed-ACK stalls
+
+            def do_GET(self):
+                status, body = api.respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                if status == 429:
+                    self.send_header("Retry-After", "0")
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "LocalPokeAPI":
+        """Starts serving from a daemon thread."""
+        threading.Thread(target=self._server.serve_forever, name="local-pokeapi", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        """Stops the server and closes its socket."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "LocalPokeAPI":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local PokeAPI stand-in server for load testing.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    record_parser = subparsers.add_parser("record", help="Record a fixture set from the response cache.")
+    record_parser.add_argument("--out", default="pokeapi_fixtures.json.gz", help="Location to write the fixture set to.")
+    synthetic_parser = subparsers.add_parser("synthetic", help="Write a synthetic fixture set.")
+    synthetic_parser.add_argument("--out", default="pokeapi_fixtures.json.gz", help="Location to write the fixture set to.")
+    serve_parser = subparsers.add_parser("serve", help="Serve a fixture set.")
+    serve_parser.add_argument("--fixtures", default=None, help="Fixture set to serve. Defaults to synthetic data.")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="The interface to listen on.")
+    serve_parser.add_argument("--port", type=int, default=8000, help="The port to listen on.")
+    serve_parser.add_argument("--latency", type=float, default=0.0, help="Delay in seconds added to every response.")
+    serve_parser.add_argument("--jitter", type=float, default=0.0, help="Maximum extra random delay in seconds.")
+    serve_parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests answered with an error.")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        from classes.response_cache import ResponseCache
+
+        fixtures = record_fixtures(ResponseCache.from_env() or ResponseCache())
+        save_fixtures(fixtures, args.out)
+        print(f"Recorded {len(fixtures['pokemon'])} Pokémon and {len(fixtures['move'])} moves to {args.out}")
+    elif args.command == "synthetic":
+        save_fixtures(synthetic_fixtures(), args.out)
+        print(f"Wrote synthetic fixtures to {args.out}")
+    else:
+        fixtures = load_fixtures(args.fixtures) if args.fixtures else synthetic_fixtures()
+        api = LocalPokeAPI(fixtures, args.host, args.port, args.latency, args.jitter, args.error_rate).start()
+        print(f"Serving {len(fixtures['pokemon'])} Pokémon on {api.base_url}")
+        print(f"Point the app at it with POKEAPI_BASE_URL={api.base_url}")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            api.stop()
@@ -0,0 +1,248 @@
+import argparse
+import os
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from classes import PROJECT_ROOT
+from classes.battle_engine import LEVEL, MODIFIER, BattleEngine, Combatant
+from classes.damage import hit_damage_batch
+
+
+FORMAT_VERSION = 1
+DEFAULT_PATH = os.path.join(PROJECT_ROOT, "data", "matchups.npz")
+
+
+def load_roster(limit: int = 151) -> List[Combatant]:
+    """
+    Loads the roster as battle combatants with their movesets in the configured version group.
+
+    Uses the dataset bundle when present, otherwise PokeAPI through GetData.
+
+    Args:
+    - limit (int): Number of Pokémon to load, starting from number 1.
+
+    Returns:
+    - List[Combatant]: The combatants in Pokédex order.
+    """
+    from classes.get_data import GetData
+
+    get_data = GetData()
+    roster = []
+    for number in range(1, limit + 1):
+        pokemon = get_data.get_pokemon_data(number)
+        if not pokemon:
+            raise RuntimeError(f"Could not fetch Pokémon {number}")
+        roster.append(Combatant.from_pokemon(pokemon, get_data.attacks(pokemon)))
+    return roster
+
+
+def expected_damage_matrix(roster: List[Combatant], level: int = LEVEL, modifier: float = MODIFIER) -> np.ndarray:
+    """
+    Calculates the expected damage per turn of every Pokémon against every other.
+
+    The attacker picks a move uniformly at random from its moveset, as the opponent does in the app,
+    so the expectation is the mean over its moves of damage on hit times hit chance.
+
+    Args:
+    - roster (List[Combatant]): The combatants.
+    - level (int): Level of both Pokémon.
+    - modifier (float): Additional modifier for damage calculation.
+
+    Returns:
+    - np.ndarray: Matrix where [i, j] is the expected damage of roster[i] attacking roster[j].
+    """
+    n_moves = max((len(c.moves) for c in roster), default=0) or 1
+    power = np.full((len(roster), n_moves), np.nan)
+    chance = np.zeros((len(roster), n_moves))
+    for i, combatant in enumerate(roster):
+        for m, move in enumerate(combatant.moves):
+            power[i, m] = np.nan if move.power is None else move.power
+            chance[i, m] = 1.0 if move.accuracy is None else min(max(move.accuracy, 0), 100) / 100
+    counts = np.array([len(c.moves) for c in roster], dtype=float)
+    attack = np.array([c.attack for c in roster], dtype=float)
+    defense = np.array([c.defense for c in roster], dtype=float)
+    damage = hit_damage_batch(level, attack[:, None, None], defense[None, :, None], power[:, None, :], modifier)
+    # Padding slots have zero hit chance, so they drop out of the sum
+    total = (damage * chance[:, None, :]).sum(axis=2)
+    return np.divide(total, counts[:, None], out=np.zeros_like(total), where=counts[:, None] > 0)
+
+
+def build(roster: List[Combatant], battles: int = 1000, seed: int = 0, path: Optional[str] = DEFAULT_PATH) -> Dict[str, np.ndarray]:
+    """
+    Precomputes expected damage, turns-to-KO and Monte Carlo win probability for every ordered pair.
+
+    Args:
+    - roster (List[Combatant]): The combatants.
+    - battles (int): Number of simulated battles per ordered pair.
+    - seed (int): Base seed; each pair gets its own derived seed so results are reproducible.
+    - path (str or None): Location to write the matrix file to, or None to skip writing.
+
+    Returns:
+    - Dict[str, np.ndarray]: The arrays stored in the matrix file.
+    """
+    n = len(roster)
+    expected = expected_damage_matrix(roster)
+    hp = np.array([c.hp for c in roster], dtype=float)
+    with np.errstate(divide="ignore"):
+        turns_to_ko = np.ceil(hp[None, :] / expected)
+    win_probability = np.zeros((n, n))
+    for i, user in enumerate(roster):
+        for j, opponent in enumerate(roster):
+            engine = BattleEngine(user, opponent, seed=(seed * n + i) * n + j)
+            win_probability[i, j] = engine.simulate(battles).win_rate
+    arrays = {
+        "version": np.array(FORMAT_VERSION),
+        "battles": np.array(battles),
+        "ids": np.array([c.id for c in roster]),
+        "names": np.array([c.name for c in roster]),
+        "expected_damage": expected,
+        "turns_to_ko": turns_to_ko,
+        "win_probability": win_probability,
+    }
+    if path:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        np.savez_compressed(path, **arrays)
+    return arrays
+
+
+class MatchupIndex:
+    """
+    Read-only query index over a precomputed matchup matrix.
+
+    Rankings are sorted once at load time, so every query is an array lookup and slice.
+    Rows are the user's Pokémon (attacking first) and columns the opponent.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        """
+        Args:
+        - arrays (Dict[str, np.ndarray]): The arrays returned by build or stored in the matrix file.
+        """
+        if int(arrays["version"]) != FORMAT_VERSION:
+            raise ValueError(f"Unsupported matchup matrix version: {int(arrays['version'])}")
+        self.ids = arrays["ids"]
+        self.names = [str(name) for name in arrays["names"]]
+        self.expected_damage = arrays["expected_damage"]
+        self.turns_to_ko = arrays["turns_to_ko"]
+        self.win_probability = arrays["win_probability"]
+        self._rows: Dict[Union[int, str], int] = {}
+        for row, (number, name) in enumerate(zip(self.ids.tolist(), self.names)):
+            self._rows[number] = row
+            self._rows[name] = row
+        # Rankings leave out mirror matches: the diagonal sorts last as -inf and is sliced off
+        ranked = self.win_probability.astype(float)
+        np.fill_diagonal(ranked, -np.inf)
+        n = len(self.names)
+        # Row j of _counters lists the user Pokémon that beat opponent j most often, best first
+        self._counters = np.argsort(-ranked, axis=0, kind="stable").T[:, :n - 1]
+        self._targets = np.argsort(-ranked, axis=1, kind="stable")[:, :n - 1]
+        self._pairs = np.argsort(-ranked, axis=None, kind="stable")[:n * n - n]
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_PATH) -> "MatchupIndex":
+        """
+        Loads a matchup matrix file.
+
+        Args:
+        - path (str): Location of the matrix file.
+
+        Returns:
+        - MatchupIndex: The query index.
+        """
+        with np.load(path) as data:
+            return cls({key: data[key] for key in data.files})
+
+    def _row(self, key: Union[int, str]) -> int:
+        if isinstance(key, str) and key.isdigit():
+            key = int(key)
+        try:
+            return self._rows[key]
+        except KeyError:
+            raise KeyError(f"Unknown Pokémon: {key}") from None
+
+    def __contains__(self, key: Union[int, str]) -> bool:
+        return (int(key) if isinstance(key, str) and key.isdigit() else key) in self._rows
+
+    def matchup(self, user: Union[int, str], opponent: Union[int, str]) -> Dict[str, float]:
+        """
+        Returns the precomputed figures for one ordered pair.
+
+        Args:
+        - user (int or str): Number or name of the user's Pokémon.
+        - opponent (int or str): Number or name of the opponent Pokémon.
+
+        Returns:
+        - Dict[str, float]: Expected damage per turn, turns-to-KO and win probability of the user's Pokémon.
+        """
+        i, j = self._row(user), self._row(opponent)
+        return {
+            "expected_damage": float(self.expected_damage[i, j]),
+            "turns_to_ko": float(self.turns_to_ko[i, j]),
+            "win_probability": float(self.win_probability[i, j]),
+        }
+
+    def best_counters(self, opponent: Union[int, str], k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Returns the Pokémon most likely to beat a given opponent, not counting the opponent itself.
+
+        Args:
+        - opponent (int or str): Number or name of the opponent Pokémon.
+        - k (int): Number of counters to return.
+
+        Returns:
+        - List[Tuple[str, float]]: Names and win probabilities, best first.
+        """
+        j = self._row(opponent)
+        return [(self.names[i], float(self.win_probability[i, j])) for i in self._counters[j, :k]]
+
+    def best_targets(self, user: Union[int, str], k: int = 5) -> List[Tuple[str, float]]:
+        """
+        Returns the opponents a given Pokémon is most likely to beat, not counting itself.
+
+        Args:
+        - user (int or str): Number or name of the user's Pokémon.
+        - k (int): Number of opponents to return.
+
+        Returns:
+        - List[Tuple[str, float]]: Names and win probabilities, best first.
+        """
+        i = self._row(user)
+        return [(self.names[j], float(self.win_probability[i, j])) for j in self._targets[i, :k]]
+
+    def top_matchups(self, k: int = 10) -> List[Tuple[str, str, float]]:
+        """
+        Returns the most one-sided ordered matchups across the roster, leaving out mirror matches.
+
+        Args:
+        - k (int): Number of matchups to return.
+
+        Returns:
+        - List[Tuple[str, str, float]]: User name, opponent name and win probability, best first.
+        """
+        n = len(self.names)
+        return [(self.names[p // n], self.names[p % n], float(self.win_probability.flat[p])) for p in self._pairs[:k]]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Precompute and query the matchup matrix.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    build_parser = subparsers.add_parser("build", help="Precompute the matchup matrix.")
+    build_parser.add_argument("--out", default=DEFAULT_PATH, help="Location to write the matrix file to.")
+    build_parser.add_argument("--limit", type=int, default=151, help="Number of Pokémon to include.")
+    build_parser.add_argument("--battles", type=int, default=1000, help="Simulated battles per ordered pair.")
+    build_parser.add_argument("--seed", type=int, default=0, help="Base random seed.")
+    counters_parser = subparsers.add_parser("counters", help="Show the best counters for a Pokémon.")
+    counters_parser.add_argument("pokemon", help="Number or name of the opponent Pokémon.")
+    counters_parser.add_argument("-k", type=int, default=5, help="Number of counters to show.")
+    counters_parser.add_argument("--matrix", default=DEFAULT_PATH, help="Location of the matrix file.")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        arrays = build(load_roster(args.limit), args.battles, args.seed, args.out)
+        print(f"Wrote {len(arrays['ids'])}x{len(arrays['ids'])} matchup matrix to {args.out}")
+    else:
+        for name, probability in MatchupIndex.load(args.matrix).best_counters(args.pokemon, args.k):
+            print(f"{name.capitalize():<12} {probability:.1%}")
@@ -1,15 +1,19 @@
 import streamlit as st
 import altair as alt
-import pandas as pd
 import plotly.graph_objects as go
 
+from classes.profiling import profiler
+
 
 class PlotCharts:
     @staticmethod
+    @profiler.timed("plot_charts.plot_stats_comparison")
     def plot_stats_comparison(user_pokemon: dict, opponent_pokemon: dict) -> go.Figure:
         """
         Creates a radar chart comparing the stats of two Pokémon.
 
+        Figures are cached per (user id, opponent id) pair across reruns and sessions; each call gets its own copy.
+
         Args:
         - user_pokemon (dict): The data of the user's Pokémon.
         - opponent_pokemon (dict): The data of the opponent's Pokémon.
@@ -18,68 +22,87 @@ class PlotCharts:
         - go.Figure: The Plotly Figure object containing the radar chart.
         """
         try:
-            user_stats = [stat['base_stat'] for stat in user_pokemon['stats']]
-            opponent_stats = [stat['base_stat'] for stat in opponent_pokemon['stats']]
-            labels = [stat['stat']['name'].capitalize() for stat in user_pokemon['stats']]
-
-            fig = go.Figure()
-
-            # Add user's Pokémon stats to the radar chart
-            fig.add_trace(go.Scatterpolar(
-                r=user_stats,
-                theta=labels,
-                line_color="magenta",
-                name=user_pokemon['name'].capitalize(),
-                fill='toself'
-            ))
-
-            # Add opponent's Pokémon stats to the radar chart
-            fig.add_trace(go.Scatterpolar(
-                r=opponent_stats,
-                theta=labels,
-                line_color="orange",
-                name=opponent_pokemon['name'].capitalize(),
-                fill='toself'
-            ))
-
-            # Update layout of the radar chart
-            fig.update_layout(
-                polar=dict(
-                    bgcolor="rgb(14, 17, 23)",
-                    radialaxis=dict(
-                        visible=True,
-                        range=[0, max(max(user_stats), max(opponent_stats)) + 10]
-                    )
-                ),
-                showlegend=True,
-                title=f"Stats Comparison: {user_pokemon['name'].capitalize()} vs {opponent_pokemon['name'].capitalize()}"
-            )
-
-            return fig
+            return PlotCharts._stats_comparison_figure(user_pokemon['id'], opponent_pokemon['id'], user_pokemon, opponent_pokemon)
 
         except Exception as e:
             st.error(f"An error occurred while plotting stats comparison: {str(e)}")
             return go.Figure()
 
     @staticmethod
-    def plot_health_barchart(user_pokemon: dict, opponent_pokemon: dict) -> go.Figure:
+    @st.cache_data(max_entries=256, show_spinner=False)
+    def _stats_comparison_figure(user_id: int, opponent_id: int, _user_pokemon: dict, _opponent_pokemon: dict) -> go.Figure:
+        """Builds the radar chart for plot_stats_comparison; the Pokémon data is not hashed, only the ids."""
+        user_pokemon, opponent_pokemon = _user_pokemon, _opponent_pokemon
+        user_stats = [stat['base_stat'] for stat in user_pokemon['stats']]
+        opponent_stats = [stat['base_stat'] for stat in opponent_pokemon['stats']]
+        labels = [stat['stat']['name'].capitalize() for stat in user_pokemon['stats']]
+
+        fig = go.Figure()
+
+        # Add user's Pokémon stats to the radar chart
+        fig.add_trace(go.Scatterpolar(
+            r=user_stats,
+            theta=labels,
+            line_color="magenta",
+            name=user_pokemon['name'].capitalize(),
+            fill='toself'
+        ))
+
+        # Add opponent's Pokémon stats to the radar chart
+        fig.add_trace(go.Scatterpolar(
+            r=opponent_stats,
+            theta=labels,
+            line_color="orange",
+            name=opponent_pokemon['name'].capitalize(),
+            fill='toself'
+        ))
+
+        # Update layout of the radar chart
+        fig.update_layout(
+            polar=dict(
+                bgcolor="rgb(14, 17, 23)",
+                radialaxis=dict(
+                    visible=True,
+                    range=[0, max(max(user_stats), max(opponent_stats)) + 10]
+                )
+            ),
+            showlegend=True,
+            title=f"Stats Comparison: {user_pokemon['name'].capitalize()} vs {opponent_pokemon['name'].capitalize()}"
+        )
+
+        return fig
+
+    @staticmethod
+    @profiler.timed("plot_charts.plot_health_barchart")
+    def plot_health_barchart(user_pokemon: dict, opponent_pokemon: dict, user_health: int, opponent_health: int) -> go.Figure:
         """
         Creates a bar chart showing health reduction of two Pokémon.
 
+        The figure is built once per battle and kept in the session state; later calls only update the bar values.
+
         Args:
         - user_pokemon (dict): The data of the user's Pokémon.
         - opponent_pokemon (dict): The data of the opponent's Pokémon.
+        - user_health (int): The remaining health of the user's Pokémon.
+        - opponent_health (int): The remaining health of the opponent's Pokémon.
 
         Returns:
         - go.Figure: The Plotly Figure object containing the bar chart.
         """
         try:
+            key = (user_pokemon['id'], opponent_pokemon['id'])
+            health = [opponent_health, user_health]
+            cached_key, fig = st.session_state.get('health_barchart', (None, None))
+            if cached_key == key:
+                fig.data[0].x = health
+                return fig
+
             fig = go.Figure()
 
             # Add bar chart for health comparison
             fig.add_trace(go.Bar(
                 y=[opponent_pokemon['name'].capitalize(), user_pokemon['name'].capitalize()],
-                x=[st.session_state['opponent_pokemon_health'], st.session_state['user_pokemon_health']],
+                x=health,
                 marker_color=['orange', 'magenta'],
                 orientation='h'
             ))
@@ -90,6 +113,7 @@ class PlotCharts:
                 margin=dict(l=40, r=40, t=0, b=40)  # Adjust margins to reduce head space
             )
 
+            st.session_state['health_barchart'] = (key, fig)
             return fig
 
         except Exception as e:
@@ -97,28 +121,35 @@ class PlotCharts:
             return go.Figure()
 
     @staticmethod
+    @profiler.timed("plot_charts.create_attack_chart")
     def create_attack_chart(selected_attack: dict) -> alt.Chart:
-        """Create Altair chart for displaying attack details."""
         """
         Create Altair chart for displaying attack details.
 
+        Charts are cached per move, with each call getting its own copy, and built from inline values without a DataFrame or fold transform.
+
         Args:
         - selected_attack (dict): The data of the attack details.
 
         Returns:
         - alt.Chart: The altair Figure object containing the bar chart.
         """
-        df_selected_attack = pd.DataFrame([selected_attack])
-        bar_chart = alt.Chart(df_selected_attack).mark_bar().encode(
+        return PlotCharts._attack_chart(selected_attack['name'], selected_attack['power'], selected_attack['accuracy'], selected_attack['pp'])
+
+    @staticmethod
+    @st.cache_data(max_entries=512, show_spinner=False)
+    def _attack_chart(name: str, power, accuracy, pp) -> alt.Chart:
+        """Builds the bar chart for create_attack_chart."""
+        values = [
+            {'attribute': 'power', 'value': power},
+            {'attribute': 'accuracy', 'value': accuracy},
+            {'attribute': 'pp', 'value': pp},
+        ]
+        bar_chart = alt.Chart(alt.Data(values=values)).mark_bar().encode(
             x=alt.X('value:Q', axis=alt.Axis(title='Value')),
             y=alt.Y('attribute:N')
-        ).transform_fold(
-            ['power', 'accuracy', 'pp']
-        ).transform_calculate(
-            attribute="datum.key",
-            value="datum.value"
         ).properties(
-            title=f"Details of {selected_attack['name'].capitalize()}",
+            title=f"Details of {name.capitalize()}",
             width=600
         )
         return bar_chart
@@ -0,0 +1,113 @@
+from typing import Callable, Iterator, Tuple
+
+
+# National Pokédex number of the last Pokémon introduced in each generation
+GENERATION_LAST_IDS: Tuple[int, ...] = (151, 251, 386, 493, 649, 721, 809, 905, 1025)
+# Entries requested per page of a PokeAPI list endpoint
+PAGE_SIZE = 200
+
+
+def roster_size(generation: int) -> int:
+    """
+    Returns the number of Pokémon available up to and including a generation.
+
+    Args:
+    - generation (int): The generation, from 1 to 9.
+
+    Returns:
+    - int: The national Pokédex number of the generation's last Pokémon.
+    """
+    if not 1 <= generation <= len(GENERATION_LAST_IDS):
+        raise ValueError(f"Unknown generation: {generation}")
+    return GENERATION_LAST_IDS[generation - 1]
+
+
+def list_url(base_url: str, endpoint: str, offset: int, limit: int) -> str:
+    """Returns the URL of one page of a PokeAPI list endpoint, in the same form as its "next" links."""
+    return f"{base_url}/{endpoint}?offset={offset}&limit={limit}"
+
+
+def page_urls(base_url: str, endpoint: str, total: int, page_size: int = PAGE_SIZE) -> Iterator[str]:
+    """
+    Yields the page URLs covering the first total entries of a PokeAPI list endpoint.
+
+    Args:
+    - base_url (str): Root of the PokeAPI endpoints.
+    - endpoint (str): The list endpoint, e.g. "pokemon".
+    - total (int): Number of entries to cover.
+    - page_size (int): Entries per page.
+
+    Returns:
+    - Iterator[str]: The page URLs in order.
+    """
+    for offset in range(0, total, page_size):
+        yield list_url(base_url, endpoint, offset, min(page_size, total - offset))
+
+
+def resource_id(url: str) -> int:
+    """Returns the id at the end of a PokeAPI resource URL, e.g. 25 for ".../pokemon/25/"."""
+    return int(url.rstrip("/").rsplit("/", 1)[1])
+
+
+def iter_resources(fetch: Callable[[str], dict], base_url: str, endpoint: str, total: int,
+                   page_size: int = PAGE_SIZE) -> Iterator[Tuple[int, str]]:
+    """
+    Streams the (id, name) pairs of a PokeAPI list endpoint one page at a time.
+
+    Only one page is held in memory, and no further pages are requested once the consumer stops
+    iterating or the endpoint runs out of entries.
+
+    Args:
+    - fetch (Callable[[str], dict]): Function returning the JSON of a URL, raising on failure.
+    - base_url (str): Root of the PokeAPI endpoints.
+    - endpoint (str): The list endpoint, e.g. "pokemon".
+    - total (int): Maximum number of entries to stream.
+    - page_size (int): Entries per page.
+
+    Returns:
+    - Iterator[Tuple[int, str]]: The id and name of each entry in order.
+    """
+    for url in page_urls(base_url, endpoint, total, page_size):
+        page = fetch(url)
+        for entry in page["results"]:
+            yield resource_id(entry["url"]), entry["name"]
+        if not page.get("next"):
+            return
+
+
+def compact_pokemon(pokemon: dict, version_group: str) -> dict:
+    """
+    Returns a compact copy of a PokeAPI /pokemon response holding only what the app uses.
+
+    The result has the same shape as Dataset.get_pokemon: sprites are reduced to the default front and
+    back images, and moves to those learnt in one version group. A late-generation Pokémon shrinks from
+    hundreds of kilobytes to a few, which keeps the in-memory caches small as the roster grows.
+
+    Args:
+    - pokemon (dict): The PokeAPI /pokemon response.
+    - version_group (str): Version group whose moves are kept.
+
+    Returns:
+    - dict: The compact Pokémon record.
+    """
+    version_group_details = [{"version_group": {"name": version_group}}]
+    return {
+        "id": pokemon["id"],
+        "name": pokemon["name"],
+        "height": pokemon["height"],
+        "weight": pokemon["weight"],
+        "sprites": {
+            "front_default": pokemon["sprites"]["front_default"],
+            "back_default": pokemon["sprites"]["back_default"],
+        },
+        "stats": [
+            {"base_stat": stat["base_stat"], "stat": {"name": stat["stat"]["name"]}}
+            for stat in pokemon["stats"]
+        ],
+        "moves": [
+            {"move": {"name": move["move"]["name"], "url": move["move"]["url"]}, "version_group_details": version_group_details}
+            for move in pokemon["moves"]
+            if any(vg["version_group"]["name"] == version_group for vg in move["version_group_details"])
+        ],
+    }
+
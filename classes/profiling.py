@@ -0,0 +1,249 @@
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from functools import wraps
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+
+logger = logging.getLogger("pokemon_battle_simulator.profiling")
+if os.environ.get("POKEMON_PROFILE_LOG") == "1":
+    logger.setLevel(logging.DEBUG)
+    logger.addHandler(logging.StreamHandler())
+
+
+class _Timing:
+    """Count, total and maximum of a series of durations in seconds."""
+    __slots__ = ("count", "total", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def add(self, seconds: float) -> None:
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {"count": self.count, "total": self.total, "mean": self.total / self.count if self.count else 0.0, "max": self.max}
+
+
+class Profiler:
+    """
+    Process-wide collector of timing spans, per-URL fetch statistics and counters.
+
+    Every recorded span and fetch is also logged as a JSON line on the
+    "pokemon_battle_simulator.profiling" logger at DEBUG level. Set POKEMON_PROFILE_LOG=1 to print them.
+    """
+
+    def __init__(self, max_urls: int = 1000):
+        """
+        Args:
+        - max_urls (int): Maximum number of distinct URLs tracked; further URLs are aggregated under "other".
+        """
+        self.max_urls = max_urls
+        self._lock = threading.Lock()
+        self._spans: Dict[str, _Timing] = {}
+        self._fetches: Dict[str, _Timing] = {}
+        self._counters: Dict[str, int] = {}
+        self._collectors: Dict[str, Callable[[], Dict[str, float]]] = {}
+        self._collector_counters: Dict[str, Tuple[str, ...]] = {}
+
+    @contextmanager
+    def span(self, name: str) -> Iterator[None]:
+        """
+        Times the enclosed block and records it under a span name.
+
+        Args:
+        - name (str): The span name, e.g. "get_data.attacks".
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record_span(name, time.perf_counter() - start)
+
+    def timed(self, name: str) -> Callable:
+        """
+        Decorator that records every call of a function as a span.
+
+        Args:
+        - name (str): The span name.
+
+        Returns:
+        - Callable: The decorator.
+        """
+        def decorator(function: Callable) -> Callable:
+            @wraps(function)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return function(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def record_span(self, name: str, seconds: float) -> None:
+        """
+        Records the duration of a span.
+
+        Args:
+        - name (str): The span name.
+        - seconds (float): The duration in seconds.
+        """
+        with self._lock:
+            self._spans.setdefault(name, _Timing()).add(seconds)
+        logger.debug(json.dumps({"event": "span", "name": name, "seconds": round(seconds, 6)}))
+
+    def record_fetch(self, url: str, seconds: float, source: str) -> None:
+        """
+        Records a data fetch and counts where it was served from.
+
+        Args:
+        - url (str): The URL fetched.
+        - seconds (float): The duration in seconds.
+        - source (str): Where the data came from, e.g. "cache", "network", "stale" or "error".
+        """
+        with self._lock:
+            key = url if url in self._fetches or len(self._fetches) < self.max_urls else "other"
+            self._fetches.setdefault(key, _Timing()).add(seconds)
+            counter = f"fetch_{source}"
+            self._counters[counter] = self._counters.get(counter, 0) + 1
+        logger.debug(json.dumps({"event": "fetch", "url": url, "source": source, "seconds": round(seconds, 6)}))
+
+    def count(self, name: str, n: int = 1) -> None:
+        """
+        Increments a counter.
+
+        Args:
+        - name (str): The counter name.
+        - n (int): The amount to add.
+        """
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + n
+
+    def register_collector(self, name: str, collector: Callable[[], Dict[str, float]], counters: Iterable[str] = ()) -> None:
+        """
+        Registers a function whose numeric results are included in every snapshot, e.g. cache statistics.
+
+        Args:
+        - name (str): The collector name, used as a metric prefix.
+        - collector (Callable): Function returning a dict of metric names to numbers.
+        - counters (Iterable[str]): Names among the results that only ever increase, exported as
+          Prometheus counters; every other result is exported as a gauge.
+        """
+        with self._lock:
+            self._collectors[name] = collector
+            self._collector_counters[name] = tuple(counters)
+
+    def snapshot(self) -> Dict[str, Dict]:
+        """
+        Returns every recorded statistic.
+
+        Returns:
+        - Dict[str, Dict]: Span and fetch timings, counters and collector gauges.
+        """
+        with self._lock:
+            spans = {name: timing.as_dict() for name, timing in self._spans.items()}
+            fetches = {url: timing.as_dict() for url, timing in self._fetches.items()}
+            counters = dict(self._counters)
+            collectors = dict(self._collectors)
+        gauges = {}
+        for name, collector in collectors.items():
+            for key, value in collector().items():
+                gauges[f"{name}_{key}"] = value
+        return {"spans": spans, "fetches": fetches, "counters": counters, "gauges": gauges}
+
+    def slowest_fetches(self, k: int = 10) -> List[Dict]:
+        """
+        Returns the URLs with the highest total fetch time.
+
+        Args:
+        - k (int): Number of URLs to return.
+
+        Returns:
+        - List[Dict]: Timing statistics with the URL, slowest first.
+        """
+        fetches = self.snapshot()["fetches"]
+        ranked = sorted(fetches.items(), key=lambda item: item[1]["total"], reverse=True)[:k]
+        return [{"url": url, **timing} for url, timing in ranked]
+
+    def prometheus(self) -> str:
+        """
+        Renders the statistics in the Prometheus text exposition format.
+
+        Returns:
+        - str: The metrics text.
+        """
+        snapshot = self.snapshot()
+        with self._lock:
+            monotonic = {f"{name}_{key}" for name, keys in self._collector_counters.items() for key in keys}
+        # Only monotonic counters take the _total suffix
+        counters = {f"{name}_total": value for name, value in snapshot["counters"].items()}
+        gauges = {}
+        for name, value in snapshot["gauges"].items():
+            if name in monotonic:
+                counters[f"{name.removesuffix('_total')}_total"] = value
+            else:
+                gauges[name] = value
+        lines = []
+        for metric, label, timings in (("span", "name", snapshot["spans"]), ("fetch", "url", snapshot["fetches"])):
+            lines.append(f"# TYPE pokemon_{metric}_seconds summary")
+            for key, timing in timings.items():
+                value = json.dumps(key)  # Quotes and escapes the label value
+                lines.append(f"pokemon_{metric}_seconds_count{{{label}={value}}} {timing['count']}")
+                lines.append(f"pokemon_{metric}_seconds_sum{{{label}={value}}} {timing['total']:.6f}")
+        for name, value in counters.items():
+            lines.append(f"# TYPE pokemon_{name} counter")
+            lines.append(f"pokemon_{name} {value}")
+        for name, value in gauges.items():
+            lines.append(f"# TYPE pokemon_{name} gauge")
+            lines.append(f"pokemon_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        """Clears every recorded span, fetch and counter; collectors stay registered."""
+        with self._lock:
+            self._spans.clear()
+            self._fetches.clear()
+            self._counters.clear()
+
+
+profiler = Profiler()
+
+
+def start_metrics_server(port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """
+    Serves profiler.prometheus() at /metrics from a daemon thread.
+
+    The metrics include every fetched URL and cache internals, so the server only listens on the
+    loopback interface unless another host is passed.
+
+    Args:
+    - port (int): The port to listen on.
+    - host (str): The interface to listen on, e.g. "0.0.0.0" for every interface.
+
+    Returns:
+    - ThreadingHTTPServer: The running server.
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = profiler.prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass  # Keep scrapes out of the app logs
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+    return server
@@ -0,0 +1,349 @@
+import argparse
+import glob
+import json
+import os
+import random
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from classes import PROJECT_ROOT
+from classes.battle_engine import LEVEL, MODIFIER, OPPONENT, USER, Combatant, Move
+from classes.damage import hit_damage, roll_hit
+
+
+DEFAULT_PATH = os.path.join(PROJECT_ROOT, ".cache", "replays.jsonl")
+
+
+@dataclass(frozen=True, slots=True)
+class TurnEvent:
+    """One attack within a turn: who attacked with which move, whether it hit, the damage and the defender's health after."""
+    turn: int
+    attacker: int
+    move: int
+    hit: bool
+    damage: int
+    hp_after: int
+
+
+@dataclass(slots=True)
+class LoggedBattle:
+    """
+    A logged battle between two Pokémon, from its starting health to its last logged turn.
+
+    A new battle is logged whenever the opponent, the user's Pokémon or its health changes outside
+    a turn, so every battle can be replayed from its seed and the user's moves alone.
+    """
+    battle_id: str
+    seed: int
+    user: Combatant
+    opponent: Combatant
+    user_hp: int
+    opponent_hp: int
+    level: int = LEVEL
+    modifier: float = MODIFIER
+    events: List[TurnEvent] = field(default_factory=list)
+
+    @property
+    def user_moves(self) -> List[int]:
+        """The index of the move the user picked on each turn."""
+        return [event.move for event in self.events if event.attacker == USER]
+
+    @property
+    def winner(self) -> Optional[int]:
+        """USER or OPPONENT for whoever first knocked the other out, or None if the battle is unfinished."""
+        return next((event.attacker for event in self.events if event.hp_after == 0), None)
+
+
+def turn_rng(seed: int, turn: int) -> random.Random:
+    """Returns the random number generator for one turn of a battle, so any turn can be replayed on its own."""
+    return random.Random(f"{seed}:{turn}")
+
+
+def play_turn(user: Combatant, opponent: Combatant, user_move: int, user_hp: int, opponent_hp: int, seed: int, turn: int,
+              level: int = LEVEL, modifier: float = MODIFIER) -> List[TurnEvent]:
+    """
+    Plays one turn: the user's Pokémon attacks and, if the opponent is still standing, the opponent answers with a random move.
+
+    Every random choice comes from turn_rng(seed, turn), so the same arguments always give the same turn.
+
+    Args:
+    - user (Combatant): The user's Pokémon.
+    - opponent (Combatant): The opponent Pokémon.
+    - user_move (int): Index of the user's move.
+    - user_hp (int): Health of the user's Pokémon before the turn.
+    - opponent_hp (int): Health of the opponent before the turn.
+    - seed (int): Seed of the battle.
+    - turn (int): Number of the turn, starting from 1.
+    - level (int): Level of both Pokémon.
+    - modifier (float): Additional modifier for damage calculation.
+
+    Returns:
+    - List[TurnEvent]: The user's attack and, if it happened, the opponent's.
+    """
+    rng = turn_rng(seed, turn)
+    move = user.moves[user_move]
+    hit = roll_hit(move.accuracy, rng)
+    damage = hit_damage(level, user.attack, opponent.defense, move.power, modifier) if hit else 0
+    opponent_hp = max(opponent_hp - damage, 0)
+    events = [TurnEvent(turn, USER, user_move, hit, damage, opponent_hp)]
+    if opponent_hp > 0 and opponent.moves:
+        index = rng.randrange(len(opponent.moves))
+        move = opponent.moves[index]
+        hit = roll_hit(move.accuracy, rng)
+        damage = hit_damage(level, opponent.attack, user.defense, move.power, modifier) if hit else 0
+        events.append(TurnEvent(turn, OPPONENT, index, hit, damage, max(user_hp - damage, 0)))
+    return events
+
+
+# Number of fields in each kind of log row: "B" starts a battle and "T" records one attack
+_ROW_LENGTHS = {"B": 9, "T": 8}
+
+
+def _encode_combatant(combatant: Combatant) -> list:
+    return [combatant.id, combatant.name, combatant.hp, combatant.attack, combatant.defense,
+            [[move.name, move.power, move.accuracy] for move in combatant.moves]]
+
+
+def _decode_combatant(row: list) -> Combatant:
+    number, name, hp, attack, defense, moves = row
+    return Combatant(number, name, hp, attack, defense, tuple(Move(*move) for move in moves))
+
+
+class ReplayLog:
+    """
+    Append-only log of battles and their turns, one compact JSON array per line.
+
+    A battle line ["B", battle_id, seed, level, modifier, user_hp, opponent_hp, user, opponent] holds
+    everything needed to replay it, and each attack is a line ["T", battle_id, turn, attacker, move,
+    hit, damage, hp_after]. Lines are written with single O_APPEND writes, so several threads or
+    processes can share one log file.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Args:
+        - path (str): Location of the log file.
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._fd = os.open(path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> Optional["ReplayLog"]:
+        """
+        Opens the log named by the POKEMON_REPLAY_LOG environment variable, or the default log.
+
+        Returns:
+        - ReplayLog or None: The log, or None if POKEMON_REPLAY_LOG is set to "" or "0".
+        """
+        path = os.environ.get("POKEMON_REPLAY_LOG", DEFAULT_PATH)
+        if path in ("", "0"):
+            return None
+        return cls(path)
+
+    def _write(self, rows: List[list]) -> None:
+        data = "".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows).encode("utf-8")
+        with self._lock:
+            os.write(self._fd, data)
+
+    def start(self, battle_id: str, seed: int, user: Combatant, opponent: Combatant, user_hp: int, opponent_hp: int,
+              level: int = LEVEL, modifier: float = MODIFIER) -> None:
+        """
+        Logs the start of a battle.
+
+        Args:
+        - battle_id (str): The battle id.
+        - seed (int): Seed of the battle.
+        - user (Combatant): The user's Pokémon.
+        - opponent (Combatant): The opponent Pokémon.
+        - user_hp (int): Starting health of the user's Pokémon.
+        - opponent_hp (int): Starting health of the opponent.
+        - level (int): Level of both Pokémon.
+        - modifier (float): Additional modifier for damage calculation.
+        """
+        self._write([["B", battle_id, seed, level, modifier, user_hp, opponent_hp, _encode_combatant(user), _encode_combatant(opponent)]])
+
+    def turn(self, battle_id: str, events: Sequence[TurnEvent]) -> None:
+        """
+        Logs the attacks of one turn.
+
+        Args:
+        - battle_id (str): The battle id.
+        - events (Sequence[TurnEvent]): The attacks returned by play_turn.
+        """
+        self._write([
+            ["T", battle_id, event.turn, event.attacker, event.move, int(event.hit), event.damage, event.hp_after]
+            for event in events
+        ])
+
+    def close(self) -> None:
+        """Closes the log file."""
+        with self._lock:
+            os.close(self._fd)
+
+
+def read_log(paths: Iterable[str]) -> Iterator[LoggedBattle]:
+    """
+    Streams the battles in one or more log files.
+
+    Lines that cannot be parsed, such as a line cut short by a crash, are skipped.
+
+    Args:
+    - paths (Iterable[str]): The log files, read in order.
+
+    Returns:
+    - Iterator[LoggedBattle]: The battles, each yielded once its last turn has been read.
+    """
+    open_battles: Dict[str, LoggedBattle] = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                # Skip anything that is not a battle or turn row of the expected length, e.g. a corrupt line
+                if not (isinstance(row, list) and row and isinstance(row[0], str)
+                        and len(row) == _ROW_LENGTHS.get(row[0]) and isinstance(row[1], str)):
+                    continue
+                if row[0] == "B":
+                    _, battle_id, seed, level, modifier, user_hp, opponent_hp, user, opponent = row
+                    try:
+                        user, opponent = _decode_combatant(user), _decode_combatant(opponent)
+                    except (TypeError, ValueError):
+                        continue
+                    if battle_id in open_battles:
+                        yield open_battles.pop(battle_id)
+                    open_battles[battle_id] = LoggedBattle(battle_id, seed, user, opponent, user_hp, opponent_hp, level, modifier)
+                elif row[0] == "T" and row[1] in open_battles:
+                    _, battle_id, turn, attacker, move, hit, damage, hp_after = row
+                    open_battles[battle_id].events.append(TurnEvent(turn, attacker, move, bool(hit), damage, hp_after))
+    yield from open_battles.values()
+
+
+def resimulate(battle: LoggedBattle, seed: Optional[int] = None, user_moves: Optional[Sequence[int]] = None) -> List[TurnEvent]:
+    """
+    Replays a logged battle from its starting state without any network access.
+
+    With the logged seed and moves this reproduces the logged turns exactly; a different seed or
+    different moves show how the same battle could have gone.
+
+    Args:
+    - battle (LoggedBattle): The logged battle.
+    - seed (int or None): Seed to replay with. Defaults to the logged seed.
+    - user_moves (Sequence[int] or None): Index of the user's move on each turn. Defaults to the logged moves.
+
+    Returns:
+    - List[TurnEvent]: The replayed attacks.
+    """
+    seed = battle.seed if seed is None else seed
+    user_moves = battle.user_moves if user_moves is None else user_moves
+    user_hp, opponent_hp = battle.user_hp, battle.opponent_hp
+    events: List[TurnEvent] = []
+    for turn, move in enumerate(user_moves, start=1):
+        turn_events = play_turn(battle.user, battle.opponent, move, user_hp, opponent_hp, seed, turn, battle.level, battle.modifier)
+        for event in turn_events:
+            if event.attacker == USER:
+                opponent_hp = event.hp_after
+            else:
+                user_hp = event.hp_after
+        events.extend(turn_events)
+    return events
+
+
+def verify(battle: LoggedBattle) -> bool:
+    """Returns whether replaying a logged battle reproduces its logged turns exactly."""
+    return resimulate(battle) == battle.events
+
+
+@dataclass(slots=True)
+class ReplaySummary:
+    """Aggregated outcomes of many logged battles."""
+    battles: int = 0
+    user_wins: int = 0
+    opponent_wins: int = 0
+    unfinished: int = 0
+    turns: int = 0
+    attacks: int = 0
+    hits: int = 0
+    damage: int = 0
+    mismatches: int = 0
+
+    @property
+    def win_rate(self) -> float:
+        """The fraction of finished battles won by the user's Pokémon."""
+        finished = self.user_wins + self.opponent_wins
+        return self.user_wins / finished if finished else 0.0
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of attacks that hit."""
+        return self.hits / self.attacks if self.attacks else 0.0
+
+
+def summarize(battles: Iterable[LoggedBattle], check: bool = False) -> ReplaySummary:
+    """
+    Aggregates the outcomes of logged battles.
+
+    Args:
+    - battles (Iterable[LoggedBattle]): The battles, e.g. from read_log.
+    - check (bool): Whether to also replay every battle and count those that do not reproduce their log.
+
+    Returns:
+    - ReplaySummary: The aggregated outcomes.
+    """
+    summary = ReplaySummary()
+    for battle in battles:
+        summary.battles += 1
+        winner = battle.winner
+        if winner == USER:
+            summary.user_wins += 1
+        elif winner == OPPONENT:
+            summary.opponent_wins += 1
+        else:
+            summary.unfinished += 1
+        summary.turns += len(battle.user_moves)
+        summary.attacks += len(battle.events)
+        summary.hits += sum(event.hit for event in battle.events)
+        summary.damage += sum(event.damage for event in battle.events)
+        if check and not verify(battle):
+            summary.mismatches += 1
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay and analyse logged battles.")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    summary_parser = subparsers.add_parser("summary", help="Aggregate the outcomes of logged battles and check that they replay.")
+    summary_parser.add_argument("paths", nargs="*", default=[DEFAULT_PATH], help="Log files or glob patterns.")
+    show_parser = subparsers.add_parser("show", help="Replay one battle turn by turn.")
+    show_parser.add_argument("battle_id", help="The battle id, as in the ?battle= URL parameter.")
+    show_parser.add_argument("paths", nargs="*", default=[DEFAULT_PATH], help="Log files or glob patterns.")
+    show_parser.add_argument("--seed", type=int, default=None, help="Replay with a different seed.")
+    args = parser.parse_args()
+
+    paths = sorted(path for pattern in args.paths for path in glob.glob(pattern))
+    if not paths:
+        parser.error(f"No log files match {' '.join(args.paths)}")
+    if args.command == "summary":
+        summary = summarize(read_log(paths), check=True)
+        print(f"{summary.battles} battles, {summary.turns} turns, {summary.unfinished} unfinished")
+        print(f"User win rate {summary.win_rate:.1%}, hit rate {summary.hit_rate:.1%}, {summary.damage} total damage")
+        print(f"{summary.mismatches} battles did not replay exactly")
+        if summary.mismatches:
+            raise SystemExit(1)
+    else:
+        for battle in read_log(paths):
+            if battle.battle_id != args.battle_id:
+                continue
+            fighters = (battle.user, battle.opponent)
+            print(f"{battle.user.name.capitalize()} vs {battle.opponent.name.capitalize()} (seed {args.seed if args.seed is not None else battle.seed})")
+            for event in resimulate(battle, seed=args.seed):
+                attacker, defender = fighters[event.attacker], fighters[1 - event.attacker]
+                outcome = f"{event.damage} damage" if event.hit else "missed"
+                print(f"  Turn {event.turn}: {attacker.name.capitalize()} used {attacker.moves[event.move].name.capitalize()}, "
+                      f"{outcome}, {defender.name.capitalize()} at {event.hp_after}")
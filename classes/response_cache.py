@@ -0,0 +1,196 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, Optional, Tuple
+from urllib.parse import urlparse
+
+from classes import PROJECT_ROOT
+
+
+# Default time-to-live in seconds per PokeAPI endpoint. Pokémon and move data never change
+# for the original games, while the paginated name lists are refreshed more often.
+DEFAULT_TTLS: Dict[str, float] = {
+    "pokemon": 30 * 24 * 3600,
+    "move": 30 * 24 * 3600,
+    "list": 24 * 3600,
+}
+DEFAULT_TTL = 7 * 24 * 3600
+DEFAULT_PATH = os.path.join(PROJECT_ROOT, ".cache", "pokeapi.sqlite3")
+# Writes between exact recounts of the cache size, which other processes sharing the file also change
+RECOUNT_INTERVAL = 256
+
+
+class ResponseCache:
+    """
+    Persistent on-disk cache of PokeAPI JSON responses backed by SQLite.
+
+    Entries are addressed by the SHA-256 of their URL, stored zlib-compressed, expire after a
+    per-endpoint TTL and are evicted least-recently-used once the cache exceeds max_bytes.
+    In offline mode entries never expire and no network request should be made on a miss.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, max_bytes: int = 200 * 1024 * 1024,
+                 ttls: Optional[Dict[str, float]] = None, offline: bool = False):
+        """
+        Args:
+        - path (str): Location of the SQLite database file.
+        - max_bytes (int): Maximum total size of the stored (compressed) responses.
+        - ttls (dict or None): Time-to-live in seconds per endpoint, overriding DEFAULT_TTLS.
+        - offline (bool): Whether to serve only from cache, ignoring expiry.
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.offline = offline
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, url TEXT NOT NULL, body BLOB NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+        # Running total of the stored sizes, so writes do not sum the whole table
+        self._total = self._size()
+        self._writes = 0
+
+    @classmethod
+    def from_env(cls) -> Optional["ResponseCache"]:
+        """
+        Creates a cache configured from environment variables.
+
+        - POKEAPI_CACHE: set to "0" to disable the cache entirely.
+        - POKEAPI_CACHE_PATH: location of the SQLite database file.
+        - POKEAPI_CACHE_MAX_MB: maximum cache size in megabytes.
+        - POKEAPI_OFFLINE: set to "1" to serve only from cache.
+
+        Returns:
+        - ResponseCache or None: The configured cache, or None if disabled.
+        """
+        if os.environ.get("POKEAPI_CACHE", "1") == "0":
+            return None
+        return cls(
+            path=os.environ.get("POKEAPI_CACHE_PATH", DEFAULT_PATH),
+            max_bytes=int(float(os.environ.get("POKEAPI_CACHE_MAX_MB", "200")) * 1024 * 1024),
+            offline=os.environ.get("POKEAPI_OFFLINE", "0") == "1",
+        )
+
+    @staticmethod
+    def key(url: str) -> str:
+        """Returns the content address of a URL."""
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def ttl(self, url: str) -> float:
+        """
+        Returns the time-to-live for a URL based on its PokeAPI endpoint.
+
+        Args:
+        - url (str): The URL of the response.
+
+        Returns:
+        - float: The time-to-live in seconds.
+        """
+        parsed = urlparse(url)
+        if parsed.query:
+            return self.ttls.get("list", DEFAULT_TTL)
+        parts = [part for part in parsed.path.split("/") if part]
+        endpoint = parts[2] if len(parts) > 2 and parts[:2] == ["api", "v2"] else ""
+        return self.ttls.get(endpoint, DEFAULT_TTL)
+
+    def get(self, url: str, allow_stale: bool = False) -> Optional[dict]:
+        """
+        Returns the cached response for a URL.
+
+        Args:
+        - url (str): The URL of the response.
+        - allow_stale (bool): Whether to return entries older than their TTL.
+
+        Returns:
+        - dict or None: The cached JSON data, or None if missing or expired.
+        """
+        key = self.key(url)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT body, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            body, created = row
+            if not (allow_stale or self.offline) and now - created > self.ttl(url):
+                return None
+            self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return json.loads(zlib.decompress(body))
+
+    def put(self, url: str, data: dict) -> None:
+        """
+        Stores a response and evicts least-recently-used entries if the cache is over size.
+
+        Args:
+        - url (str): The URL of the response.
+        - data (dict): The JSON data to store.
+        """
+        key = self.key(url)
+        body = zlib.compress(json.dumps(data, separators=(",", ":")).encode("utf-8"))
+        now = time.time()
+        with self._lock:
+            replaced = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, url, body, size, created, accessed) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, url, body, len(body), now, now),
+            )
+            self._writes += 1
+            if self._writes % RECOUNT_INTERVAL == 0:
+                self._total = self._size()
+            else:
+                self._total += len(body) - (replaced[0] if replaced else 0)
+            if self._total > self.max_bytes:
+                self._evict()
+
+    def _size(self) -> int:
+        """Returns the exact total size of the stored responses."""
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    def _evict(self) -> None:
+        """Deletes least-recently-used entries until the cache fits in max_bytes."""
+        # Recount before deleting anything, since another process may already have evicted entries
+        self._total = self._size()
+        if self._total <= self.max_bytes:
+            return
+        freed = 0
+        stale_keys = []
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY accessed"):
+            if self._total - freed <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            freed += size
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", stale_keys)
+        self._total -= freed
+
+    def items(self) -> Iterator[Tuple[str, dict]]:
+        """Yields every cached (url, data) pair, regardless of expiry."""
+        with self._lock:
+            rows = self._conn.execute("SELECT url, body FROM responses").fetchall()
+        for url, body in rows:
+            yield url, json.loads(zlib.decompress(body))
+
+    def clear(self) -> None:
+        """Deletes every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._total = 0
+
+    def close(self) -> None:
+        """Closes the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
@@ -0,0 +1,84 @@
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Iterable, Mapping, Tuple
+
+
+@dataclass(frozen=True, slots=True)
+class RosterIndex:
+    """
+    Immutable mapping between Pokémon numbers, names and selection labels such as "Bulbasaur (1)".
+
+    Built once per process; every lookup in either direction is a tuple index or dictionary hit.
+    """
+    ids: Tuple[int, ...]
+    names: Tuple[str, ...]
+    labels: Tuple[str, ...]
+    _positions: Mapping[int, int]
+    _ids_by_name: Mapping[str, int]
+    _ids_by_label: Mapping[str, int]
+
+    @classmethod
+    def from_names(cls, names: Iterable[str], first_id: int = 1) -> "RosterIndex":
+        """
+        Builds the index from Pokémon names in Pokédex order.
+
+        Args:
+        - names (Iterable[str]): The Pokémon names.
+        - first_id (int): Number of the first Pokémon.
+
+        Returns:
+        - RosterIndex: The index.
+        """
+        names = tuple(names)
+        ids = tuple(range(first_id, first_id + len(names)))
+        return cls.from_entries(zip(ids, names))
+
+    @classmethod
+    def from_entries(cls, entries: Iterable[Tuple[int, str]]) -> "RosterIndex":
+        """
+        Builds the index from (number, name) pairs.
+
+        Args:
+        - entries (Iterable[Tuple[int, str]]): The Pokémon numbers and names.
+
+        Returns:
+        - RosterIndex: The index.
+        """
+        entries = tuple(entries)
+        ids = tuple(number for number, _ in entries)
+        names = tuple(name for _, name in entries)
+        labels = tuple(f"{name.capitalize()} ({number})" for number, name in entries)
+        return cls(
+            ids=ids,
+            names=names,
+            labels=labels,
+            _positions=MappingProxyType({number: i for i, number in enumerate(ids)}),
+            _ids_by_name=MappingProxyType(dict(zip(names, ids))),
+            _ids_by_label=MappingProxyType(dict(zip(labels, ids))),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, number: int) -> bool:
+        return number in self._positions
+
+    def position(self, number: int) -> int:
+        """Returns the zero-based position of a Pokémon number, e.g. for a selectbox index."""
+        return self._positions[number]
+
+    def name(self, number: int) -> str:
+        """Returns the name of a Pokémon number."""
+        return self.names[self._positions[number]]
+
+    def label(self, number: int) -> str:
+        """Returns the selection label of a Pokémon number."""
+        return self.labels[self._positions[number]]
+
+    def id_of_name(self, name: str) -> int:
+        """Returns the number of a Pokémon name."""
+        return self._ids_by_name[name]
+
+    def id_of_label(self, label: str) -> int:
+        """Returns the number of a selection label."""
+        return self._ids_by_label[label]
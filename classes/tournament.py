@@ -0,0 +1,202 @@
+import argparse
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from classes import PROJECT_ROOT
+from classes.battle_engine import BattleEngine, Combatant
+
+
+DEFAULT_CHECKPOINT = os.path.join(PROJECT_ROOT, "data", "tournament.json")
+
+# Roster shared by every battle in a worker process, set once by the pool initializer
+_roster: List[Combatant] = []
+
+
+@dataclass(frozen=True, slots=True)
+class Standing:
+    """A Pokémon's aggregated tournament record with a 95% Wilson confidence interval on its win rate."""
+    id: int
+    name: str
+    wins: int
+    losses: int
+    draws: int
+    win_rate: float
+    ci_low: float
+    ci_high: float
+
+
+def wilson_interval(wins: int, battles: int, z: float = 1.96) -> Tuple[float, float]:
+    """
+    Calculates the Wilson score interval for a win rate.
+
+    Args:
+    - wins (int): Number of battles won.
+    - battles (int): Number of battles fought.
+    - z (float): Standard normal quantile of the confidence level.
+
+    Returns:
+    - Tuple[float, float]: The lower and upper bounds of the interval.
+    """
+    if battles == 0:
+        return 0.0, 1.0
+    p = wins / battles
+    denominator = 1 + z * z / battles
+    centre = (p + z * z / (2 * battles)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / battles + z * z / (4 * battles * battles)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def _init_worker(roster: List[Combatant]) -> None:
+    global _roster
+    _roster = roster
+
+
+def _run_shard(shard: int, rows: List[int], battles: int, seed: int) -> Tuple[int, List[List[int]]]:
+    """
+    Plays every user Pokémon in rows against every other Pokémon in the roster.
+
+    Returns the shard number and per-Pokémon [wins, losses, draws] totals, so results stay the
+    size of the roster however many battles the shard runs.
+    """
+    rng = random.Random(f"{seed}:{shard}")
+    totals = [[0, 0, 0] for _ in _roster]
+    for i in rows:
+        for j, opponent in enumerate(_roster):
+            if i == j:
+                continue
+            summary = BattleEngine(_roster[i], opponent, seed=rng.getrandbits(64)).simulate(battles)
+            totals[i][0] += summary.user_wins
+            totals[i][1] += summary.opponent_wins
+            totals[i][2] += summary.draws
+            totals[j][0] += summary.opponent_wins
+            totals[j][1] += summary.user_wins
+            totals[j][2] += summary.draws
+    return shard, totals
+
+
+class Tournament:
+    """
+    Round-robin Monte Carlo tournament across the roster, sharded over worker processes.
+
+    Every Pokémon battles every other Pokémon both as the user (attacking first) and as the opponent.
+    Shards are groups of user Pokémon with their own seed derived from the tournament seed, so the
+    standings do not depend on the number of workers or the order shards finish in. Shard results
+    are folded into running totals as they arrive and checkpointed, so an interrupted run resumes
+    from the last completed shard.
+    """
+
+    def __init__(self, roster: List[Combatant], battles: int = 100, seed: int = 0, shard_size: int = 4,
+                 checkpoint_path: Optional[str] = None):
+        """
+        Args:
+        - roster (List[Combatant]): The combatants.
+        - battles (int): Number of battles per ordered pair.
+        - seed (int): Tournament seed.
+        - shard_size (int): Number of user Pokémon per shard.
+        - checkpoint_path (str or None): Location of the checkpoint file, or None to disable checkpointing.
+        """
+        self.roster = roster
+        self.battles = battles
+        self.seed = seed
+        self.checkpoint_path = checkpoint_path
+        self.shards = [list(range(start, min(start + shard_size, len(roster)))) for start in range(0, len(roster), shard_size)]
+        self.totals = [[0, 0, 0] for _ in roster]
+        self.completed: set = set()
+        self._load_checkpoint()
+
+    def _config(self) -> Dict:
+        return {"ids": [c.id for c in self.roster], "battles": self.battles, "seed": self.seed, "shards": self.shards}
+
+    def _load_checkpoint(self) -> None:
+        if not self.checkpoint_path or not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        if checkpoint["config"] != self._config():
+            return  # A different tournament; start over
+        self.totals = checkpoint["totals"]
+        self.completed = set(checkpoint["completed"])
+
+    def _save_checkpoint(self) -> None:
+        if not self.checkpoint_path:
+            return
+        directory = os.path.dirname(self.checkpoint_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temporary = f"{self.checkpoint_path}.tmp"
+        with open(temporary, "w", encoding="utf-8") as f:
+            json.dump({"config": self._config(), "completed": sorted(self.completed), "totals": self.totals}, f)
+        os.replace(temporary, self.checkpoint_path)  # Atomic, so a crash never leaves a torn checkpoint
+
+    def run(self, workers: Optional[int] = None, progress: bool = False) -> List[Standing]:
+        """
+        Runs the remaining shards and returns the standings.
+
+        Args:
+        - workers (int or None): Number of worker processes. Defaults to the number of CPUs.
+        - progress (bool): Whether to print progress after each shard.
+
+        Returns:
+        - List[Standing]: The standings, best win rate first.
+        """
+        pending = [shard for shard in range(len(self.shards)) if shard not in self.completed]
+        workers = workers or os.cpu_count() or 1
+        start = time.monotonic()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(self.roster,)) as executor:
+            in_flight = set()
+            while pending or in_flight:
+                # Keep a bounded number of shards queued so memory stays flat on long runs
+                while pending and len(in_flight) < 2 * workers:
+                    shard = pending.pop(0)
+                    in_flight.add(executor.submit(_run_shard, shard, self.shards[shard], self.battles, self.seed))
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    shard, totals = future.result()
+                    for record, shard_record in zip(self.totals, totals):
+                        for k in range(3):
+                            record[k] += shard_record[k]
+                    self.completed.add(shard)
+                    self._save_checkpoint()
+                    if progress:
+                        print(f"Shard {len(self.completed)}/{len(self.shards)} done ({time.monotonic() - start:.1f}s)", flush=True)
+        return self.standings()
+
+    def standings(self) -> List[Standing]:
+        """
+        Returns the standings from the results gathered so far.
+
+        Returns:
+        - List[Standing]: The standings, best win rate first.
+        """
+        standings = []
+        for combatant, (wins, losses, draws) in zip(self.roster, self.totals):
+            battles = wins + losses + draws
+            ci_low, ci_high = wilson_interval(wins, battles)
+            standings.append(Standing(combatant.id, combatant.name, wins, losses, draws,
+                                      wins / battles if battles else 0.0, ci_low, ci_high))
+        return sorted(standings, key=lambda standing: standing.win_rate, reverse=True)
+
+
+if __name__ == "__main__":
+    from classes.matchups import load_roster
+
+    parser = argparse.ArgumentParser(description="Run a round-robin Monte Carlo tournament across the roster.")
+    parser.add_argument("--limit", type=int, default=151, help="Number of Pokémon to include.")
+    parser.add_argument("--battles", type=int, default=100, help="Battles per ordered pair.")
+    parser.add_argument("--seed", type=int, default=0, help="Tournament seed.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes.")
+    parser.add_argument("--shard-size", type=int, default=4, help="User Pokémon per shard.")
+    parser.add_argument("--checkpoint", default=DEFAULT_CHECKPOINT, help="Checkpoint file used to resume interrupted runs.")
+    parser.add_argument("--top", type=int, default=20, help="Number of standings to print.")
+    args = parser.parse_args()
+
+    tournament = Tournament(load_roster(args.limit), args.battles, args.seed, args.shard_size, args.checkpoint)
+    for rank, standing in enumerate(tournament.run(args.workers, progress=True)[:args.top], start=1):
+        print(f"{rank:>3}. {standing.name.capitalize():<12} {standing.win_rate:.1%} "
+              f"[{standing.ci_low:.1%}, {standing.ci_high:.1%}] {standing.wins}W {standing.losses}L {standing.draws}D")
@@ -0,0 +1,166 @@
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, List, Optional
+
+import requests
+
+from classes import pokedex
+from classes.get_data import GetData
+
+
+@dataclass(slots=True)
+class WarmupReport:
+    """Counts of URLs warmed, retried and failed by warm_up, updated from the fetching threads through add."""
+    fetched: int = 0
+    retries: int = 0
+    failed: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def add(self, fetched: int = 0, retries: int = 0, failed: Optional[str] = None) -> None:
+        """
+        Adds to the counts under the report's lock.
+
+        Args:
+        - fetched (int): Number of URLs fetched.
+        - retries (int): Number of retries made.
+        - failed (str or None): A URL that could not be fetched.
+        """
+        with self._lock:
+            self.fetched += fetched
+            self.retries += retries
+            if failed is not None:
+                self.failed.append(failed)
+
+
+def fetch_with_retry(url: str, retries: int = 4, backoff: float = 0.5, report: Optional[WarmupReport] = None) -> Optional[dict]:
+    """
+    Fetches a URL through the response cache, retrying with exponential backoff and jitter.
+
+    Args:
+    - url (str): The URL to fetch.
+    - retries (int): Number of retries after the first attempt.
+    - backoff (float): Delay in seconds before the first retry; doubled for each later retry.
+    - report (WarmupReport or None): Report to count retries and failures in.
+
+    Returns:
+    - dict or None: The JSON data, or None if every attempt failed.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return GetData.download(url)
+        except requests.exceptions.RequestException:
+            if attempt == retries:
+                break
+            if report:
+                report.add(retries=1)
+            time.sleep(backoff * 2 ** attempt * (0.5 + random.random()))
+    if report:
+        report.add(failed=url)
+    return None
+
+
+def _fetch_all(urls: List[str], label: str, workers: int, retries: int, backoff: float, report: WarmupReport,
+               progress: Optional[Callable[[str], None]]) -> List[Optional[dict]]:
+    """Fetches URLs with bounded concurrency, returning results in input order and reporting progress."""
+    results: List[Optional[dict]] = [None] * len(urls)
+    step = max(1, len(urls) // 10)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(fetch_with_retry, url, retries, backoff, report): i for i, url in enumerate(urls)}
+        for done, future in enumerate(as_completed(futures), start=1):
+            results[futures[future]] = future.result()
+            if progress and (done % step == 0 or done == len(urls)):
+                progress(f"{label}: {done}/{len(urls)}")
+    report.add(fetched=sum(result is not None for result in results))
+    return results
+
+
+def warm_up(limit: Optional[int] = None, version_group: Optional[str] = None, workers: int = 8, retries: int = 4, backoff: float = 0.5,
+            progress: Optional[Callable[[str], None]] = print) -> WarmupReport:
+    """
+    Fills the response cache with every PokeAPI response the app requests for the roster.
+
+    This is the pages of the Pokémon list, each Pokémon by name and every move in the given version group.
+    Move URLs shared between Pokémon are fetched once.
+
+    Args:
+    - limit (int or None): Number of Pokémon to warm, starting from number 1. Defaults to the configured generation's roster.
+    - version_group (str or None): Version group whose moves are warmed. Defaults to GetData.version_group.
+    - workers (int): Maximum number of concurrent requests.
+    - retries (int): Number of retries per URL.
+    - backoff (float): Delay in seconds before the first retry.
+    - progress (Callable or None): Function called with progress messages, or None for silence.
+
+    Returns:
+    - WarmupReport: Counts of URLs fetched, retried and failed.
+    """
+    limit = limit or pokedex.roster_size(GetData.generation)
+    version_group = version_group or GetData.version_group
+    report = WarmupReport()
+    start = time.monotonic()
+
+    def fetch_page(url: str) -> dict:
+        page = fetch_with_retry(url, retries, backoff, report)
+        if page is None:
+            raise requests.exceptions.ConnectionError(f"Could not fetch {url}")
+        report.add(fetched=1)
+        return page
+
+    try:
+        names = [name for _, name in pokedex.iter_resources(fetch_page, GetData.base_url, "pokemon", limit)]
+    except requests.exceptions.RequestException:
+        report.seconds = time.monotonic() - start
+        return report
+    pokemon_urls = [f"{GetData.base_url}/pokemon/{name}" for name in names]
+    roster = _fetch_all(pokemon_urls, "Pokémon", workers, retries, backoff, report, progress)
+
+    # dict.fromkeys dedupes while keeping first-seen order
+    move_urls = list(dict.fromkeys(
+        move['move']['url']
+        for pokemon in roster if pokemon
+        for move in pokemon['moves']
+        if any(vg['version_group']['name'] == version_group for vg in move['version_group_details'])
+    ))
+    _fetch_all(move_urls, "Moves", workers, retries, backoff, report, progress)
+
+    report.seconds = time.monotonic() - start
+    return report
+
+
+def start_background_warm_up(**kwargs) -> threading.Thread:
+    """
+    Runs warm_up in a daemon thread, for use as a startup hook.
+
+    Args:
+    - **kwargs: Arguments passed to warm_up.
+
+    Returns:
+    - threading.Thread: The started thread.
+    """
+    kwargs.setdefault("progress", None)
+    thread = threading.Thread(target=warm_up, kwargs=kwargs, name="pokeapi-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Warm the PokeAPI response cache for the whole roster.")
+    parser.add_argument("--limit", type=int, default=None, help="Number of Pokémon to warm. Defaults to the POKEMON_GENERATION roster.")
+    parser.add_argument("--version-group", default=None, help="Version group whose moves are warmed. Defaults to POKEMON_VERSION_GROUP.")
+    parser.add_argument("--workers", type=int, default=8, help="Maximum number of concurrent requests.")
+    parser.add_argument("--retries", type=int, default=4, help="Number of retries per URL.")
+    args = parser.parse_args()
+
+    if GetData.response_cache is None:
+        parser.error("The response cache is disabled (POKEAPI_CACHE=0)")
+    report = warm_up(args.limit, args.version_group, args.workers, args.retries)
+    print(f"Warmed {report.fetched} responses in {report.seconds:.1f}s with {report.retries} retries")
+    if report.failed:
+        print(f"{len(report.failed)} failed:")
+        for url in report.failed:
+            print(f"  {url}")
+        raise SystemExit(1)
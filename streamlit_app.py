@@ -1,95 +1,139 @@
 import streamlit as st
-import re
-import random
+import os
+import time
 import pandas as pd
 
+from classes.battle_engine import Combatant
+from classes.battle_store import BattleRecord, BattleStore, new_seed
 from classes.get_data import GetData
+from classes.matchups import DEFAULT_PATH as MATCHUPS_PATH, MatchupIndex
 from classes.plot_charts import PlotCharts
+from classes.profiling import profiler, start_metrics_server
+from classes.replay import ReplayLog, play_turn
+from classes.roster import RosterIndex
+from classes.warmup import start_background_warm_up
 
 
+rerun_start = time.perf_counter()
+
 # Creating instances of classes
 get_data = GetData()
 plot_charts = PlotCharts()
 
-# Initialise session state variables if not already initialised
-def init_session_state():
-    default_values = {
-        'user_pokemon_name': None,
-        'user_pokemon_number': 1,
-        'opponent_pokemon': None,
-        'user_pokemon_health': None,
-        'opponent_pokemon_health': None,
-        'user_attack_selected': None,
-        'battle_in_progress': False
-    }
+# Streamlit app title
+st.title("Pokémon Battle Simulator")
+
+# Battle records shared by every session of the process, or kept in SQLite with POKEMON_BATTLE_DB
+@st.cache_resource()
+def get_battle_store() -> BattleStore:
+    """Create the battle store."""
+    return BattleStore.from_env()
 
-    for key, value in default_values.items():
-        if key not in st.session_state:
-            st.session_state[key] = value
+battle_store = get_battle_store()
 
-init_session_state()
+# Append-only log of every battle turn, for replay and analysis with `python -m classes.replay`
+@st.cache_resource()
+def get_replay_log() -> ReplayLog | None:
+    """Open the replay log unless disabled."""
+    return ReplayLog.from_env()
 
-# Streamlit app title
-st.title("Pokémon Battle Simulator")
+replay_log = get_replay_log()
 
-# Simple persistent state: The dictionary returned by `get_state()` will be persistent across browser sessions.
+# Optionally warm the response cache for the whole roster once per process
 @st.cache_resource()
-def get_state() -> dict:
-    """Get the current session state."""
-    return {}
+def start_warm_up() -> None:
+    """Start warming the PokeAPI response cache in the background."""
+    start_background_warm_up()
+
+if os.environ.get("POKEAPI_WARMUP") == "1" and GetData.response_cache:
+    start_warm_up()
+
+# Optionally serve Prometheus-style metrics once per process
+@st.cache_resource()
+def start_metrics() -> None:
+    """Start the /metrics endpoint."""
+    start_metrics_server(int(os.environ["POKEMON_METRICS_PORT"]), os.environ.get("POKEMON_METRICS_HOST", "127.0.0.1"))
+
+if os.environ.get("POKEMON_METRICS_PORT"):
+    start_metrics()
+
+# Precomputed matchup matrix, loaded once per process if it has been built
+@st.cache_resource()
+def get_matchups() -> MatchupIndex | None:
+    """Load the precomputed matchup matrix if available."""
+    return MatchupIndex.load(MATCHUPS_PATH) if os.path.exists(MATCHUPS_PATH) else None
+
+# Roster index of numbers, names and selection labels, built once per process
+@st.cache_resource()
+def get_roster() -> RosterIndex:
+    """Build the roster index from the Pokémon names."""
+    names = get_data.get_all_pokemon_names()
+    if not names:
+        raise RuntimeError("Could not load the Pokémon list")  # Raising keeps the failure out of the cache
+    return RosterIndex.from_names(names)
+
+roster = get_roster()
+
+# Resume this session's battle, or the one named in the URL, so a reload or restart continues it.
+# Battle ids are unguessable tokens, so the URL works as a resume link: whoever holds it can play the battle.
+def load_battle() -> BattleRecord:
+    """Get the battle record of the current session, creating one if needed."""
+    battle_id = st.session_state.get("battle_id") or st.query_params.get("battle")
+    battle = battle_store.get(battle_id) if battle_id else None
+    if battle is None or battle.user_id not in roster:
+        battle = battle_store.create(user_id=roster.ids[0])
+    st.session_state["battle_id"] = battle.battle_id
+    if st.query_params.get("battle") != battle.battle_id:
+        st.query_params["battle"] = battle.battle_id
+    return battle
+
+battle = load_battle()
+
+# Apply changes to the battle record this run loaded, rerunning from the stored record if another session changed it first
+def commit_battle(**changes) -> BattleRecord:
+    """Update the battle record only if it has not changed since this run read it."""
+    record = battle_store.update(battle.battle_id, expected_version=battle.version, **changes)
+    if record is None:
+        st.rerun()
+    return record
 
 # Function to display Pokémon selection widgets
 def display_widgets() -> tuple:
     """Display widgets for Pokémon selection."""
-    options = [f"{name.capitalize()} ({i+1})" for i, name in enumerate(get_data.get_all_pokemon_names())]
-    index = state.get("selection_index", 0)
+    number = battle.user_id
     return (
-        number_placeholder.slider("Select your favourite Pokémon by number", 1, 151, state.get("selection_number", 1)),
-        option_placeholder.selectbox("Or select your favourite Pokémon by name", options, index=index),
+        number_placeholder.slider("Select your favourite Pokémon by number", roster.ids[0], roster.ids[-1], number),
+        option_placeholder.selectbox("Or select your favourite Pokémon by name", roster.ids, index=roster.position(number), format_func=roster.label),
     )
 
-# Initialise session state
-state = get_state()
-if "selection_number" not in state:
-    state["selection_number"] = 1
-if "selection_name" not in state:
-    state["selection_name"] = get_data.get_all_pokemon_names()[0]
-if "selection_index" not in state:
-    state["selection_index"] = 0
-
 # Initial layout
 number_placeholder = st.empty()
 option_placeholder = st.empty()
 
 # Display Pokémon selection widgets and handle input changes
-selected_number, selected_option = display_widgets()
+selected_number, selected_option_id = display_widgets()
 
 input_changed = False
 
 # Handle changes in slider
-if selected_number != state["selection_number"] and not input_changed:
-    state["selection_number"] = selected_number
-    state["selection_name"] = get_data.get_all_pokemon_names()[selected_number - 1]
-    state["selection_index"] = selected_number - 1
+if selected_number != battle.user_id and not input_changed:
+    battle = commit_battle(user_id=selected_number, turn=0, seed=new_seed())
     input_changed = True
-    selected_number, selected_option = display_widgets()
+    selected_number, selected_option_id = display_widgets()
 
 # Handle changes in select box
-selected_option_id = int(re.match(r".* \((\d+)\)", selected_option).group(1))
-if selected_option_id != state["selection_number"] and not input_changed:
-    state["selection_number"] = selected_option_id
-    state["selection_name"] = get_data.get_all_pokemon_names()[selected_option_id - 1]
-    state["selection_index"] = selected_option_id - 1
+if selected_option_id != battle.user_id and not input_changed:
+    battle = commit_battle(user_id=selected_option_id, turn=0, seed=new_seed())
     input_changed = True
-    selected_number, selected_option = display_widgets()
+    selected_number, selected_option_id = display_widgets()
 
 # Get user Pokémon data
-user_pokemon = get_data.get_pokemon_data(state["selection_name"])
-if st.session_state.user_pokemon_health is None:
-    st.session_state.user_pokemon_health = user_pokemon['stats'][0]['base_stat']
+user_pokemon = get_data.resolve_pokemon(roster.name(battle.user_id))
+if battle.user_hp is None:
+    battle = commit_battle(user_hp=user_pokemon['stats'][0]['base_stat'])
 
 # Display user Pokémon data and moves
-pokemon_attacks = get_data.attacks(user_pokemon)
+pokemon_attacks = get_data.resolve_attacks(user_pokemon)
 df_attacks = pd.DataFrame(pokemon_attacks)
 with st.container(border=True):
     col1, col2 = st.columns(2)
@@ -97,29 +141,40 @@ with st.container(border=True):
         get_data.display_pokemon_data(user_pokemon, f"{user_pokemon['name'].capitalize()} I choose you!", "front", fight = False)
     with col2:
         st.subheader(f"{user_pokemon['name'].capitalize()} Moves")
-        st.dataframe(df_attacks)
+        with profiler.span("render.dataframe"):
+            st.dataframe(df_attacks)
 
 # Button to initiate battle with a wild Pokémon
-if st.button("Wild Pokémon appeared!") or (st.session_state.battle_in_progress and not st.session_state.opponent_pokemon):
+if st.button("Wild Pokémon appeared!") or (battle.in_progress and battle.opponent_id is None):
     opponent_pokemon_name = get_data.get_random_pokemon_name()
-    st.session_state.opponent_pokemon = get_data.get_pokemon_data(opponent_pokemon_name)
-    st.session_state.opponent_pokemon_health = st.session_state.opponent_pokemon['stats'][0]['base_stat']
-    st.session_state.battle_in_progress = True
+    new_opponent = get_data.resolve_pokemon(opponent_pokemon_name)
+    battle = commit_battle(opponent_id=new_opponent['id'], opponent_hp=new_opponent['stats'][0]['base_stat'], in_progress=True, turn=0, seed=new_seed())
+
+# Opponent Pokémon data, resolved from its number through the shared caches
+opponent_pokemon = get_data.resolve_pokemon(battle.opponent_id) if battle.opponent_id is not None else None
 
 # Display opponent Pokémon data and start battle if opponent exists
-if st.session_state.opponent_pokemon:
+if opponent_pokemon:
     col1, col2 = st.columns(2)
     with col1:
         with st.container(border=True):
             get_data.display_pokemon_data(user_pokemon, f"Go! {user_pokemon['name'].upper()}", "back", fight = True)
     with col2:
         with st.container(border=True):
-            get_data.display_pokemon_data(st.session_state.opponent_pokemon, f"Wild {st.session_state.opponent_pokemon['name'].capitalize()} appeared!", "front", fight = True)
+            get_data.display_pokemon_data(opponent_pokemon, f"Wild {opponent_pokemon['name'].capitalize()} appeared!", "front", fight = True)
 
     # Display radar chart for stats comparison
-    if st.session_state.opponent_pokemon:
-        fig = plot_charts.plot_stats_comparison(user_pokemon, st.session_state.opponent_pokemon)
-        st.plotly_chart(fig)
+    if opponent_pokemon:
+        fig = plot_charts.plot_stats_comparison(user_pokemon, opponent_pokemon)
+        with profiler.span("render.plotly_chart"):
+            st.plotly_chart(fig)
+
+    # Display precomputed odds for this matchup
+    matchups = get_matchups()
+    if matchups and user_pokemon['id'] in matchups and opponent_pokemon['id'] in matchups:
+        matchup = matchups.matchup(user_pokemon['id'], opponent_pokemon['id'])
+        counters = ", ".join(f"{name.capitalize()} ({probability:.0%})" for name, probability in matchups.best_counters(opponent_pokemon['id'], 3))
+        st.caption(f"Estimated win chance: {matchup['win_probability']:.0%} · Best counters: {counters}")
 
     # Display user Pokémon moves and allow move selection
     with st.container(border=True):
@@ -129,60 +184,82 @@ if st.session_state.opponent_pokemon:
         # Plot details of selected attack using Altair
         if user_attack_name:
             selected_attack = next((attack for attack in pokemon_attacks if attack['name'] == user_attack_name), None)
-            st.session_state.user_attack_selected = selected_attack
             if selected_attack:
                 bar_chart = plot_charts.create_attack_chart(selected_attack)
-                st.altair_chart(bar_chart)
+                with profiler.span("render.altair_chart"):
+                    st.altair_chart(bar_chart)
 
     # Button to use the selected attack
     if st.button("Use Move", key="use_move"):
+        user_combatant = Combatant.from_pokemon(user_pokemon, pokemon_attacks)
+        opponent_combatant = Combatant.from_pokemon(opponent_pokemon, get_data.resolve_attacks(opponent_pokemon))
+        previous = battle
+        events = play_turn(user_combatant, opponent_combatant, pokemon_attacks.index(selected_attack), previous.user_hp, previous.opponent_hp, previous.seed, previous.turn + 1)
+        user_event = events[0]
+        opponent_event = events[1] if len(events) > 1 else None
+
+        # Commit the turn before anything is rendered; commit_battle reruns instead if another session got there first
+        battle = commit_battle(
+            user_hp=opponent_event.hp_after if opponent_event else previous.user_hp,
+            opponent_hp=user_event.hp_after,
+            turn=previous.turn + 1,
+            in_progress=previous.in_progress and all(event.hp_after > 0 for event in events),
+        )
+
+        # Only committed turns are logged. The first turn also logs both Pokémon and their health, so the battle can be replayed from the log alone
+        if replay_log:
+            if previous.turn == 0:
+                replay_log.start(previous.battle_id, previous.seed, user_combatant, opponent_combatant, previous.user_hp, previous.opponent_hp)
+            replay_log.turn(battle.battle_id, events)
+
         col1, col2 = st.columns(2)
         with col1:
             with st.container(border=True):
-                damage_to_opponent = get_data.calculate_damage(50, user_pokemon['stats'][1]['base_stat'], st.session_state.opponent_pokemon['stats'][2]['base_stat'], st.session_state.user_attack_selected['power'], st.session_state.user_attack_selected['accuracy'], 1)
-                st.session_state.opponent_pokemon_health -= damage_to_opponent
-                if st.session_state.opponent_pokemon_health < 0:
-                    st.session_state.opponent_pokemon_health = 0
                 st.write(f"{user_pokemon['name'].capitalize()} used {user_attack_name.capitalize()}!")
-                if damage_to_opponent == 0:
+                if user_event.damage == 0:
                     st.write("But, it failed!")
                 else:
-                    st.write(f"It dealt {damage_to_opponent} damage!")
-                st.write(f"Wild {st.session_state.opponent_pokemon['name'].capitalize()}'s remaining health: {st.session_state.opponent_pokemon_health}")
+                    st.write(f"It dealt {user_event.damage} damage!")
+                st.write(f"Wild {opponent_pokemon['name'].capitalize()}'s remaining health: {battle.opponent_hp}")
 
-                if st.session_state.opponent_pokemon_health == 0:
-                    st.write(f"Wild {st.session_state.opponent_pokemon['name'].capitalize()} fainted!")
-                    st.session_state.battle_in_progress = False
+                if battle.opponent_hp == 0:
+                    st.write(f"Wild {opponent_pokemon['name'].capitalize()} fainted!")
         
         with col2:
             with st.container(border=True):
-                if st.session_state.opponent_pokemon_health > 0:
-                    opponent_attacks = get_data.attacks(st.session_state.opponent_pokemon)
-                    if opponent_attacks:
-                        opponent_attack = random.choice(opponent_attacks)
-                        damage_to_user = get_data.calculate_damage(50, st.session_state.opponent_pokemon['stats'][1]['base_stat'], user_pokemon['stats'][2]['base_stat'], opponent_attack['power'], opponent_attack['accuracy'], 1)
-                        st.session_state.user_pokemon_health -= damage_to_user
-                        if st.session_state.user_pokemon_health < 0:
-                            st.session_state.user_pokemon_health = 0
-                        st.write(f"Wild {st.session_state.opponent_pokemon['name'].capitalize()} used {opponent_attack['name'].capitalize()}!")
-                        if damage_to_user == 0:
-                            st.write("But, it failed!")
-                        else:
-                            st.write(f"It dealt {damage_to_user} damage!")
-                        st.write(f"{user_pokemon['name'].capitalize()}'s remaining health: {st.session_state.user_pokemon_health}")
-
-                        if st.session_state.user_pokemon_health == 0:
-                            st.write(f"{user_pokemon['name'].capitalize()} fainted!")
-                            st.session_state.battle_in_progress = False
+                if opponent_event:
+                    opponent_attack = opponent_combatant.moves[opponent_event.move]
+                    st.write(f"Wild {opponent_pokemon['name'].capitalize()} used {opponent_attack.name.capitalize()}!")
+                    if opponent_event.damage == 0:
+                        st.write("But, it failed!")
+                    else:
+                        st.write(f"It dealt {opponent_event.damage} damage!")
+                    st.write(f"{user_pokemon['name'].capitalize()}'s remaining health: {battle.user_hp}")
+
+                    if battle.user_hp == 0:
+                        st.write(f"{user_pokemon['name'].capitalize()} fainted!")
 
         # Plot health bar chart after each round of attacks
-        fig = plot_charts.plot_health_barchart(user_pokemon, st.session_state.opponent_pokemon)
-        st.plotly_chart(fig)
+        fig = plot_charts.plot_health_barchart(user_pokemon, opponent_pokemon, battle.user_hp, battle.opponent_hp)
+        with profiler.span("render.plotly_chart"):
+            st.plotly_chart(fig)
 
 # Button to reset user Pokémon's health after battle
-if st.session_state.user_pokemon_health == 0:
+if battle.user_hp == 0:
 
     if st.button("Use Max Potion"):
-        st.session_state.user_pokemon_health = user_pokemon['stats'][0]['base_stat']
-        st.write(f"{user_pokemon['name'].capitalize()}'s health has been reset to {st.session_state.user_pokemon_health}.")
-        st.session_state.battle_in_progress = True
\ No newline at end of file
+        battle = commit_battle(user_hp=user_pokemon['stats'][0]['base_stat'], in_progress=True, turn=0, seed=new_seed())
+        st.write(f"{user_pokemon['name'].capitalize()}'s health has been reset to {battle.user_hp}.")
+
+profiler.record_span("app.rerun", time.perf_counter() - rerun_start)
+
+# Performance debug panel, shown only when the server runs with POKEMON_DEBUG=1
+if os.environ.get("POKEMON_DEBUG") == "1":
+    with st.expander("Performance"):
+        snapshot = profiler.snapshot()
+        st.write("**Spans**")
+        st.dataframe(pd.DataFrame.from_dict(snapshot["spans"], orient="index").sort_values("total", ascending=False))
+        st.write("**Slowest fetches**")
+        st.dataframe(pd.DataFrame(profiler.slowest_fetches()))
+        st.write("**Counters and caches**")
+        st.json({**snapshot["counters"], **snapshot["gauges"]})